@@ -1,2 +1,17 @@
+import sys
+
 from .base import *
-from .resources.icon import IconManager
\ No newline at end of file
+
+__all__ = [_name for _name in dir() if not _name.startswith("_") and _name != "sys"] + ["IconManager"]
+
+
+def __getattr__(name):
+    # IconManager pulls in the image loading machinery, so it is imported on first use.
+    if name == "IconManager":
+        from .resources.icon import IconManager
+        return IconManager
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    from .resources.icon import IconManager
@@ -1,7 +1,66 @@
+import sys
+import threading
+
 from Qt import QtCore, QtGui, QtWidgets, QtCompat
 from Qt.QtCore import QMetaObject
 
-glob_current_active_parent = None
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+
+class ContextLocal(object):
+    """a value local to the current contextvars context (asyncio task, thread), or to the thread
+    on pythons without contextvars."""
+
+    def __init__(self, name, default=None):
+        self._default = default
+        if ContextVar is not None:
+            self._var = ContextVar(name, default=default)
+        else:
+            self._local = threading.local()
+
+    def get(self):
+        if ContextVar is not None:
+            return self._var.get()
+        return getattr(self._local, "value", self._default)
+
+    def set(self, value):
+        if ContextVar is not None:
+            self._var.set(value)
+        else:
+            self._local.value = value
+
+
+# stack of the LayoutMixin objects entered with `with`, innermost last. kept immutable so a copied
+# context (a new asyncio task) never shares it with its origin.
+_parentStack = ContextLocal("qqtParentStack", ())
+
+
+def currentParent():
+    """the innermost active `with` layout in this context, which qcreate attaches new objects to."""
+    stack = _parentStack.get()
+    return stack[-1] if stack else None
+
+
+def pushParent(parent):
+    _parentStack.set(_parentStack.get() + (parent,))
+
+
+def popParent():
+    _parentStack.set(_parentStack.get()[:-1])
+
+
+# qqt.profiler.Profiler installed by qqt.profiler.enable(). None keeps qcreate free of any timing.
+activeProfiler = None
+
+
+def __getattr__(name):
+    # read-only stand-in for the module global this stack replaced.
+    if name == "glob_current_active_parent":
+        return currentParent()
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
 
 
 def qcreate(uiClass, *args, **kwargs):
@@ -9,12 +68,36 @@ def qcreate(uiClass, *args, **kwargs):
 
     :param uiClass:
     :param args:
-    :param kwargs:
+    :param kwargs: lazy=True defers construction: a LazyWidget placeholder is attached instead and builds
+        uiClass the first time it is shown or its widget is accessed. builder, a callable taking the
+        new widget, then fills in its content.
     :return: uiClass
     """
-    from .widgets.base import LabelMixin
+    prof = activeProfiler
+    if prof is not None:
+        return _profiledQcreate(prof, uiClass, args, kwargs, sys._getframe(1))
+    return _qcreate(uiClass, args, kwargs)
+
+
+def _profiledQcreate(prof, uiClass, args, kwargs, frame):
+    record = prof.begin(uiClass, frame)
+    try:
+        return _qcreate(uiClass, args, kwargs, frame)
+    finally:
+        prof.end(record)
+
+
+def _qcreate(uiClass, args, kwargs, frame=None):
+    from .widgets.base import LabelMixin, LazyWidget
+
+    if kwargs.pop("lazy", False) and not issubclass(uiClass, QtWidgets.QLayout):
+        lazyArgs = (uiClass, args, kwargs)
+        lazyKwargs = {"builder": kwargs.pop("builder", None)}
+        # the placeholder is recorded at the caller's site, not here.
+        if activeProfiler is not None and frame is not None:
+            return _profiledQcreate(activeProfiler, LazyWidget, lazyArgs, lazyKwargs, frame)
+        return _qcreate(LazyWidget, lazyArgs, lazyKwargs)
 
-    global glob_current_active_parent
     layoutType = kwargs.pop("layoutType", None)
     parent = kwargs.pop("parent", None)
 
@@ -26,22 +109,23 @@ def qcreate(uiClass, *args, **kwargs):
         tmpObject = None
         if isinstance(newObject, LabelMixin):
             tmpObject = newObject
-            if newObject.parentWidget:
-                newObject = newObject.parentWidget
+            container = newObject.labelContainer()
+            if container is not None:
+                newObject = container
 
         if not isinstance(newObject, QtWidgets.QLayout):
             if layoutType:
                 lay = layoutType()
                 newObject.setLayout(lay)
 
-        par = glob_current_active_parent
-        if par:
-            if isinstance(newObject, QtWidgets.QSpacerItem):
-                par.addSpacerItem(newObject)
-            elif isinstance(newObject, QtWidgets.QWidget):
-                par.addWidget(newObject)
-            elif isinstance(newObject, QtWidgets.QLayout):
-                par.addLayout(newObject)
+        # the parent's add() unwraps a labelled field itself, or adopts its label (Form).
+        par = currentParent()
+        if par is not None:
+            child = tmpObject if tmpObject is not None else newObject
+            if activeProfiler is None:
+                par.add(child)
+            else:
+                activeProfiler.timed("attach", par.add, child)
 
         if tmpObject:
             newObject = tmpObject
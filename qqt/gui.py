@@ -1,6 +1,52 @@
-from .widgets.base import *
-from .widgets.displays import *
-from .widgets.inputs import *
-from .widgets.listview import *
-from .layouts import *
-from .menu import *
+"""all qqt widgets, layouts and menus in one namespace.
+
+submodules are imported the first time one of their names is touched (module __getattr__, PEP 562),
+so `import qqt.gui` stays cheap. `from qqt.gui import *` still loads and exports everything.
+the table must list every public name of the star-imported modules; tests/test_gui.py checks it
+against an eager star-import.
+"""
+import importlib
+import sys
+
+_exportsByModule = (
+    (".base", ["QtCompat", "QtCore", "QtGui", "QtWidgets", "qcreate", "sys"]),
+    (".layouts", ["FormLayout", "GridLayout", "HBoxLayout", "LayoutMixin", "StackedLayout", "VBoxLayout",
+                  "base"]),
+    (".widgets.base", ["GenericWidget", "LabelMixin", "LabelPainter", "LazyWidget", "drawLabel", "fontMetrics",
+                       "textWidth"]),
+    (".widgets.displays", ["Form", "FrameWidget", "Image", "ImageMemory", "SeparatorLine", "SimpleFrameWidget",
+                           "Spacer", "Splitter", "TabLayout", "TabWidget", "pixmapAsync"]),
+    (".widgets.inputs", ["Button", "Checkbox", "ColorInput", "ComboBox", "ComboBoxDefaults", "ComboFilterModel",
+                         "ComboModel", "ComboPopup", "FloatField", "FloatSliderField", "IconButton", "InputMixin",
+                         "IntField", "IntSliderField", "LabelPosition", "LabelledInput", "NumericField",
+                         "NumericSliderField", "Qt", "RadioButtonGroup", "Slider", "SliderFieldDefaults",
+                         "StringField", "StringFieldDefaults", "pixmap", "time", "weakref"]),
+    (".widgets.listview", ["BaseList", "FileBrowser", "FileTreeFilter", "ItemDelegate", "SimpleFilter",
+                           "TextItem", "TextList", "basestring"]),
+    (".menu", ["ContextMenu", "IconManager", "partial", "setContextMenu", "summonMenu"]),
+)
+
+_exports = dict((name, moduleName) for moduleName, names in _exportsByModule for name in names)
+
+__all__ = sorted(_exports)
+
+
+def __getattr__(name):
+    try:
+        moduleName = _exports[name]
+    except KeyError:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+    value = getattr(importlib.import_module(moduleName, "qqt"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # no module level __getattr__ before python 3.7, load everything up front.
+    for _name in __all__:
+        __getattr__(_name)
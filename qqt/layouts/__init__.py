@@ -1,22 +1,135 @@
-from .. import QtWidgets
+from .. import QtCore, QtWidgets
 from .. import base
 
 
+class _LayoutRequestSink(QtCore.QObject):
+    """application event filter dropping every LayoutRequest event while installed.
+
+    the widgets whose request was dropped are kept in received.
+    """
+
+    def __init__(self):
+        super(_LayoutRequestSink, self).__init__()
+        self.received = []
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.LayoutRequest:
+            self.received.append(obj)
+            return True
+        return False
+
+
 class LayoutMixin(object):
-    def __init__(self, *args, **kwargs):
-        self.prevParent = None
-        self.secPrevParent = None
+    # set to True (per class, or per instance through batched()) to build the whole outermost
+    # `with` block with updates suspended on the owning widget, and layout activation suspended on
+    # it and on the widgets attached in the block. when the block ends, the LayoutRequest events
+    # posted meanwhile are dropped (batchStats["avoided"]) and each layout is activated once.
+    batchUpdates = False
+    batchStats = {"blocks": 0, "attached": 0, "avoided": 0}
+    # (root layout, nesting depth) of the batch running in this context.
+    _batch = base.ContextLocal("qqtBatch", None)
 
     def __enter__(self):
-        if base.glob_current_active_parent:
-            self.prevParent = base.glob_current_active_parent
-        else:
-            self.prevParent = self
-        base.glob_current_active_parent = self
+        base.pushParent(self)
+
+        batch = LayoutMixin._batch.get()
+        if batch is None and self.batchUpdates:
+            self._beginBatch()
+            batch = (self, 0)
+        if batch is not None:
+            LayoutMixin._batch.set((batch[0], batch[1] + 1))
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        base.glob_current_active_parent = self.prevParent
+        base.popParent()
+
+        batch = LayoutMixin._batch.get()
+        if batch is not None:
+            root, depth = batch
+            if depth == 1:
+                LayoutMixin._batch.set(None)
+                root._endBatch()
+            else:
+                LayoutMixin._batch.set((root, depth - 1))
+
+    def batched(self, enabled=True):
+        """enable batched construction for this layout's `with` block. returns self."""
+        self.batchUpdates = enabled
+        return self
+
+    def _ownerWidget(self):
+        if isinstance(self, QtWidgets.QWidget):
+            return self
+        return self.parentWidget()
+
+    def _beginBatch(self):
+        owner = self._ownerWidget()
+        ownerLayout = owner.layout() if owner is not None else None
+        # the last two collect the attached widgets and the layouts suspended on them.
+        self._batchState = (owner, ownerLayout,
+                            owner is not None and owner.updatesEnabled(),
+                            ownerLayout is not None and ownerLayout.isEnabled(),
+                            [], [])
+        if owner is not None:
+            owner.setUpdatesEnabled(False)
+        if ownerLayout is not None:
+            ownerLayout.setEnabled(False)
+
+    def _endBatch(self):
+        owner, ownerLayout, updatesEnabled, layoutEnabled, attached, suspended = self._batchState
+        self._batchState = None
+
+        for layout in suspended:
+            if base.QtCompat.isValid(layout):
+                layout.setEnabled(True)
+        if ownerLayout is not None:
+            ownerLayout.setEnabled(layoutEnabled)
+
+        # the layouts of hidden widgets are activated when they are shown, the visible ones right
+        # below, so the LayoutRequest events posted while building have nothing left to do. a hidden
+        # owner keeps its request though: showing it posts another one, which Qt merges into it.
+        widgets = [owner] if owner is not None and owner.isVisible() else []
+        for child in attached:
+            if base.QtCompat.isValid(child):
+                widgets.append(child)
+                widgets.extend(child.findChildren(QtWidgets.QWidget))
+        sink = _LayoutRequestSink()
+        app = QtCore.QCoreApplication.instance()
+        app.installEventFilter(sink)
+        try:
+            for widget in widgets:
+                QtCore.QCoreApplication.sendPostedEvents(widget, QtCore.QEvent.LayoutRequest)
+        finally:
+            app.removeEventFilter(sink)
+
+        for widget in sink.received:
+            if widget is not owner and widget.layout() is not None and widget.isVisible():
+                widget.layout().activate()
+        if ownerLayout is not None and owner.isVisible():
+            ownerLayout.activate()
+        if owner is not None:
+            owner.setUpdatesEnabled(updatesEnabled)
+
+        LayoutMixin.batchStats["blocks"] += 1
+        LayoutMixin.batchStats["avoided"] += len(sink.received)
+
+    @staticmethod
+    def _countAttach(child=None):
+        batch = LayoutMixin._batch.get()
+        if batch is None:
+            return
+        LayoutMixin.batchStats["attached"] += 1
+        attached, suspended = batch[0]._batchState[4:]
+        if isinstance(child, QtWidgets.QWidget):
+            attached.append(child)
+            layout = child.layout()
+            if layout is not None and layout.isEnabled():
+                layout.setEnabled(False)
+                suspended.append(layout)
+
+    @classmethod
+    def resetBatchStats(cls):
+        LayoutMixin.batchStats = {"blocks": 0, "attached": 0, "avoided": 0}
 
     def setRatio(self, *ratios):
         for idx, ratio in enumerate(ratios):
@@ -28,10 +141,12 @@ class LayoutMixin(object):
 
     def add(self, child):
         from ..widgets.base import LabelMixin
-        if isinstance(child,LabelMixin) and child.parentWidget is not None:
-            self.add(child.parentWidget)
+        if isinstance(child, LabelMixin) and child.labelContainer() is not None:
+            self.add(child.labelContainer())
             return
         else:
+            self._countAttach(child)
+
             if isinstance(child, QtWidgets.QSpacerItem):
                 self.addSpacerItem(child)
             elif isinstance(child, QtWidgets.QWidget):
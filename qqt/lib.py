@@ -1,6 +1,7 @@
 from functools import wraps
 
 from .base import QtCore, QtGui, QtWidgets, QMetaObject, QtCompat
+from .resources.cache import LRUCache
 
 # for python2 & 3 cross compatibility
 try:
@@ -13,6 +14,11 @@ try:
 except:
     from shiboken2 import wrapInstance
 
+try:
+    from Qt import QtSvg
+except ImportError:
+    QtSvg = None
+
 
 class classproperty(object):
     """http://stackoverflow.com/questions/5189699/how-can-i-make-a-class-property-in-python
@@ -24,22 +30,20 @@ class classproperty(object):
     def __get__(self, obj, owner):
         return self.f(owner)
 
-loadUi = QtCompat.loadUi
 
+def loadUi(uifile, baseinstance=None):
+    """qqt.uicache.loadUi; uicache is imported on first use."""
+    from .uicache import loadUi
+    return loadUi(uifile, baseinstance)
 
-def pixmap(image, w=None, h=None, aspectRatioMode=QtCore.Qt.KeepAspectRatio):
-    if isinstance(image, basestring):
-        pic = QtGui.QPixmap(image)
-    elif isinstance(image, QtGui.QPixmap):
-        pic = image
-    else:
-        raise ValueError("image either need to be in filePath or pixmap")
-
-    currW, currH = pic.width(), pic.height()
 
-    if currW <= 0 or currH <= 0:
-        return pic
+def scaledSize(currW, currH, w=None, h=None, aspectRatioMode=QtCore.Qt.KeepAspectRatio, fit=False):
+    """target size used by pixmap() when fitting a currW x currH image into w/h.
 
+    given both w and h, the longer side of the image is scaled to its bound, which may overflow the
+    other one. fit=True instead fits inside w x h, or covers it with KeepAspectRatioByExpanding, like
+    QSize.scaled.
+    """
     if w and not h:
         newW = w
         newH = float(w) / currW * currH
@@ -51,26 +55,157 @@ def pixmap(image, w=None, h=None, aspectRatioMode=QtCore.Qt.KeepAspectRatio):
     elif w and h:
         if aspectRatioMode == QtCore.Qt.IgnoreAspectRatio:
             newW, newH = w, h
+        elif fit:
+            size = QtCore.QSize(currW, currH).scaled(w, h, aspectRatioMode)
+            newW, newH = size.width(), size.height()
+        elif currW > currH:
+            newH = 1.0 * w / currW * currH
+            newW = w
         else:
-            if currW > currH:
-                newH = 1.0 * w / currW * currH
-                newW = w
-            else:
-                newW = 1.0 * h / currH * currW
-                newH = h
+            newW = 1.0 * h / currH * currW
+            newH = h
     else:
         newW, newH = currW, currH
 
-    return pic.scaled(newW, newH)
+    return int(newW), int(newH)
+
+
+def isSvg(path):
+    return str(path).lower().endswith((".svg", ".svgz"))
+
+
+def renderSvg(renderer, w=None, h=None, aspectRatioMode=QtCore.Qt.KeepAspectRatio, fit=False):
+    """rasterize a QSvgRenderer into a transparent QImage fitted to w/h. safe to call from worker threads."""
+    if not renderer.isValid():
+        return QtGui.QImage()
+    defaultSize = renderer.defaultSize()
+    newW, newH = defaultSize.width(), defaultSize.height()
+    if (w or h) and not defaultSize.isEmpty():
+        newW, newH = scaledSize(newW, newH, w=w, h=h, aspectRatioMode=aspectRatioMode, fit=fit)
+    elif w and h:
+        newW, newH = w, h
+
+    image = QtGui.QImage(max(newW, 1), max(newH, 1), QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.transparent)
+    painter = QtGui.QPainter(image)
+    renderer.render(painter)
+    painter.end()
+    return image
+
+
+def readImage(path, w=None, h=None, aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+              transformMode=QtCore.Qt.FastTransformation, fit=False):
+    """decode path into a QImage fitted to w/h (see scaledSize). safe to call from worker threads.
+
+    transformMode picks fast or smooth scaling; for jpeg it sets the quality of the reader's own
+    reduced-size decode. scaled results go through DiskCache.shared when a disk cache is enabled.
+    """
+    from .resources.bundle import IconBundle
+    from .resources.diskcache import DiskCache
+
+    cacheKey = None
+    diskCache = DiskCache.shared
+    if diskCache is not None and (w or h):
+        cacheKey = diskCache.key(path, w, h, aspectRatioMode, transformMode, fit)
+        if cacheKey:
+            image = diskCache.load(cacheKey)
+            if image is not None:
+                return image
+
+    entry = IconBundle.find(path)
+    if isSvg(path) and QtSvg is not None:
+        if entry:
+            bundle, name = entry
+            renderer = QtSvg.QSvgRenderer(QtCore.QByteArray(bundle.data(name).tobytes()))
+        else:
+            renderer = QtSvg.QSvgRenderer(path)
+        image = renderSvg(renderer, w=w, h=h, aspectRatioMode=aspectRatioMode, fit=fit)
+    elif entry:
+        bundle, name = entry
+        image = bundle.image(name)
+        if image.isNull() or not (w or h):
+            return image
+        newW, newH = scaledSize(image.width(), image.height(), w=w, h=h, aspectRatioMode=aspectRatioMode,
+                                fit=fit)
+        image = image.scaled(newW, newH, QtCore.Qt.IgnoreAspectRatio, transformMode)
+    else:
+        reader = QtGui.QImageReader(path)
+        if not (w or h):
+            return reader.read()
+
+        # the reader's own scaling is smooth. jpeg decodes straight to the target size, much faster
+        # than decoding at full resolution, and its quality option picks a fast or smooth finish.
+        # other formats are only reader-scaled for smooth results. formats that can't tell their
+        # size before decoding (icns) are scaled once decoded.
+        smooth = transformMode == QtCore.Qt.SmoothTransformation
+        srcSize = reader.size()
+        if (not srcSize.isEmpty() and reader.supportsOption(QtGui.QImageIOHandler.ScaledSize) and
+                (smooth or bytes(reader.format().data()) == b"jpeg")):
+            newW, newH = scaledSize(srcSize.width(), srcSize.height(), w=w, h=h, aspectRatioMode=aspectRatioMode,
+                                    fit=fit)
+            reader.setScaledSize(QtCore.QSize(newW, newH))
+            reader.setQuality(100 if smooth else 0)
+            image = reader.read()
+        else:
+            image = reader.read()
+            if not image.isNull():
+                newW, newH = scaledSize(image.width(), image.height(), w=w, h=h,
+                                        aspectRatioMode=aspectRatioMode, fit=fit)
+                image = image.scaled(newW, newH, QtCore.Qt.IgnoreAspectRatio, transformMode)
+
+    if cacheKey:
+        diskCache.store(cacheKey, image)
+    return image
+
+
+def pixmap(image, w=None, h=None, aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+           transformMode=QtCore.Qt.FastTransformation):
+    if isinstance(image, basestring):
+        from .resources.bundle import IconBundle
+        if w or h or IconBundle.find(image) or isSvg(image):
+            return QtGui.QPixmap.fromImage(readImage(image, w=w, h=h, aspectRatioMode=aspectRatioMode,
+                                                     transformMode=transformMode))
+        return QtGui.QPixmap(image)
+    elif isinstance(image, QtGui.QPixmap):
+        pic = image
+    else:
+        raise ValueError("image either need to be in filePath or pixmap")
+
+    currW, currH = pic.width(), pic.height()
+
+    if currW <= 0 or currH <= 0:
+        return pic
+
+    newW, newH = scaledSize(currW, currH, w=w, h=h, aspectRatioMode=aspectRatioMode)
+    return pic.scaled(newW, newH, QtCore.Qt.IgnoreAspectRatio, transformMode)
+
+
+def pixmapAsync(image, callback, w=None, h=None, target=None, aspectRatioMode=QtCore.Qt.KeepAspectRatio,
+                transformMode=QtCore.Qt.FastTransformation):
+    """decode image on a worker thread and pass the scaled pixmap to callback on the GUI thread.
+
+    returns a transparent placeholder to show in the meantime. the request is dropped if target is destroyed first.
+    """
+    from .resources.loader import ImageLoader
+
+    if isinstance(image, QtGui.QPixmap):
+        pic = pixmap(image, w=w, h=h, aspectRatioMode=aspectRatioMode, transformMode=transformMode)
+        callback(pic)
+        return pic
+    elif not isinstance(image, basestring):
+        raise ValueError("image either need to be in filePath or pixmap")
+
+    ImageLoader.request(image, callback, w=w, h=h, target=target, aspectRatioMode=aspectRatioMode,
+                        transformMode=transformMode)
+    return ImageLoader.placeholder(w or h, h or w)
 
 
 def createToolBtn(text, parent=None, slot=None, shortcut=None, icon=None,
                   toolTip=None, checkable=False, size=32):
     action = QtWidgets.QAction(text, parent)
     if icon is not None:
-        pix = QtGui.QPixmap(icon)
-        pix.scaled(size, size)
-        action.setIcon(QtGui.QIcon(pix))
+        from .resources.icon import IconManager
+        action.setIcon(IconManager.toIcon(icon, size=(size, size)))
     if shortcut is not None:
         action.setShortcut(shortcut)
     if toolTip is not None:
@@ -99,3 +234,30 @@ def busyCursor(func):
             QtWidgets.QApplication.restoreOverrideCursor()
 
     return _func
+
+
+_fontMetrics = {}
+# bounded by entry count: every width costs 1.
+_textWidths = LRUCache(maxBytes=20000, costFunc=lambda width: 1)
+
+
+def fontMetrics(font=None):
+    """shared QFontMetrics of font, the application font by default."""
+    if font is None:
+        font = QtWidgets.QApplication.font()
+    key = font.key()
+    metrics = _fontMetrics.get(key)
+    if metrics is None:
+        metrics = _fontMetrics[key] = QtGui.QFontMetrics(font)
+    return metrics
+
+
+def textWidth(text, font=None):
+    """width of text in font (the application font by default), cached per font and text."""
+    if font is None:
+        font = QtWidgets.QApplication.font()
+    key = (font.key(), text)
+    width = _textWidths.get(key)
+    if width is None:
+        width = _textWidths.put(key, fontMetrics(font).width(text))
+    return width
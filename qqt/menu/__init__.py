@@ -1,5 +1,6 @@
 from functools import partial
 from .. import QtCore, QtGui, QtWidgets
+from ..resources.icon import IconManager
 
 
 def setContextMenu(widget, menu):
@@ -26,9 +27,8 @@ class ContextMenu(QtWidgets.QMenu):
         action.setText(label)
 
         if icon:
-            if isinstance(icon, str):
-                icon = QtGui.QIcon(icon)
-            action.setIcon(icon)
+            size = self.style().pixelMetric(QtWidgets.QStyle.PM_SmallIconSize, None, self)
+            action.setIcon(IconManager.toIcon(icon, iconSize=(size, size)))
 
         if func:
             action.triggered.connect(func)
@@ -0,0 +1,166 @@
+"""opt-in construction profiler for qcreate.
+
+    from qqt import profiler
+
+    with profiler.profiling() as prof:
+        panel = MyPanel()
+    print(prof.report())                    # per widget class, most expensive first
+    print(prof.report(by="site"))           # per qcreate call site
+    prof.saveChromeTrace("panel.json")      # open in chrome://tracing or ui.perfetto.dev
+
+each qcreate call records its inclusive time, its self time (minus nested qcreate calls), and the
+time spent in LabelMixin._initLayout and in attaching the result to the active `with` layout.
+nothing is timed while no profiler is enabled.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from . import base
+
+_timer = getattr(time, "perf_counter", time.time)
+
+
+class Record(object):
+    __slots__ = ("className", "site", "threadId", "start", "duration", "childTime", "sections")
+
+    def __init__(self, className, site, threadId, start):
+        self.className = className
+        self.site = site
+        self.threadId = threadId
+        self.start = start
+        self.duration = 0.0
+        self.childTime = 0.0
+        # [(name, start, duration)]
+        self.sections = []
+
+    @property
+    def selfTime(self):
+        return self.duration - self.childTime
+
+    def sectionTime(self, name):
+        return sum(duration for sectionName, start, duration in self.sections if sectionName == name)
+
+
+class Profiler(object):
+    """collects one Record per qcreate call while installed as qqt.base.activeProfiler."""
+
+    def __init__(self):
+        self.records = []
+        self._origin = _timer()
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, uiClass, frame):
+        code = frame.f_code
+        site = "{0}:{1} ({2})".format(code.co_filename, frame.f_lineno, code.co_name)
+        record = Record(getattr(uiClass, "__name__", str(uiClass)), site, threading.current_thread().ident,
+                        _timer())
+        self._stack().append(record)
+        return record
+
+    def end(self, record):
+        record.duration = _timer() - record.start
+        stack = self._stack()
+        if stack and stack[-1] is record:
+            stack.pop()
+        if stack:
+            stack[-1].childTime += record.duration
+        self.records.append(record)
+
+    def timed(self, section, func, *args, **kwargs):
+        """call func, adding its duration to the running qcreate record as section."""
+        stack = self._stack()
+        start = _timer()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if stack:
+                stack[-1].sections.append((section, start, _timer() - start))
+
+    def clear(self):
+        self.records = []
+
+    def summary(self, by="class"):
+        """rows of totals per widget class (by="class") or per call site (by="site"), slowest first.
+
+        times are in seconds. "total" is inclusive of nested qcreate calls, so rows of nested widgets
+        overlap; sort on "self" to find where the time actually goes.
+        """
+        rows = {}
+        for record in self.records:
+            key = record.className if by == "class" else record.site
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {"key": key, "count": 0, "total": 0.0, "self": 0.0, "initLayout": 0.0,
+                                   "attach": 0.0}
+            row["count"] += 1
+            row["total"] += record.duration
+            row["self"] += record.selfTime
+            row["initLayout"] += record.sectionTime("initLayout")
+            row["attach"] += record.sectionTime("attach")
+        return sorted(rows.values(), key=lambda row: row["total"], reverse=True)
+
+    def report(self, by="class", sortKey="total", limit=None):
+        """the summary as a text table."""
+        rows = sorted(self.summary(by), key=lambda row: row[sortKey], reverse=True)[:limit]
+        lines = ["{0:>7} {1:>10} {2:>10} {3:>11} {4:>10}  {5}".format(
+            "count", "total ms", "self ms", "initLayout", "attach ms", by)]
+        for row in rows:
+            lines.append("{count:>7} {0:>10.2f} {1:>10.2f} {2:>11.2f} {3:>10.2f}  {key}".format(
+                row["total"] * 1000.0, row["self"] * 1000.0, row["initLayout"] * 1000.0, row["attach"] * 1000.0,
+                **row))
+        return "\n".join(lines)
+
+    def chromeTrace(self):
+        """the records as a Chrome trace event dict (complete "X" events, microseconds)."""
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            events.append({"name": record.className, "cat": "qcreate", "ph": "X", "pid": pid,
+                           "tid": record.threadId, "ts": (record.start - self._origin) * 1e6,
+                           "dur": record.duration * 1e6, "args": {"site": record.site}})
+            for name, start, duration in record.sections:
+                events.append({"name": name, "cat": name, "ph": "X", "pid": pid, "tid": record.threadId,
+                               "ts": (start - self._origin) * 1e6, "dur": duration * 1e6,
+                               "args": {"widget": record.className}})
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def saveChromeTrace(self, path):
+        with open(path, "w") as f:
+            json.dump(self.chromeTrace(), f)
+
+
+def enable(profiler=None):
+    """install profiler (a new Profiler by default) on qcreate and return it."""
+    base.activeProfiler = profiler or Profiler()
+    return base.activeProfiler
+
+
+def disable():
+    """stop profiling. returns the profiler that was installed, if any."""
+    profiler, base.activeProfiler = base.activeProfiler, None
+    return profiler
+
+
+def isEnabled():
+    return base.activeProfiler is not None
+
+
+@contextmanager
+def profiling(profiler=None):
+    """profile qcreate calls inside the block, restoring the previous profiler afterwards."""
+    previous = base.activeProfiler
+    current = enable(profiler)
+    try:
+        yield current
+    finally:
+        base.activeProfiler = previous
@@ -0,0 +1,160 @@
+"""single file icon bundles.
+
+layout (little endian)::
+
+    magic "QQTB" | version uint16 | entry count uint32
+    per entry: name length uint16 | utf-8 name | data offset uint64 | data length uint64
+    concatenated file data
+
+pack a directory with ``python -m qqt.resources.bundle <iconDir> <bundle.qqtb>``.
+"""
+import mmap
+import os
+import struct
+import sys
+
+from Qt import QtGui
+
+MAGIC = b"QQTB"
+VERSION = 1
+EXTENSION = ".qqtb"
+
+_header = struct.Struct("<4sHI")
+_nameLen = struct.Struct("<H")
+_entry = struct.Struct("<QQ")
+
+
+def isBundle(path):
+    path = str(path)
+    if not os.path.isfile(path):
+        return False
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def packBundle(dirPath, bundlePath, extensions=(".png", ".jpg", ".jpeg", ".bmp", ".gif", ".svg", ".ico")):
+    """write every file below dirPath matching extensions into bundlePath. returns the number of entries."""
+    dirPath = str(dirPath)
+    files = []
+    for root, dirNames, fileNames in os.walk(dirPath):
+        dirNames.sort()
+        for fileName in sorted(fileNames):
+            if extensions and os.path.splitext(fileName)[1].lower() not in extensions:
+                continue
+            fullPath = os.path.join(root, fileName)
+            name = os.path.relpath(fullPath, dirPath).replace(os.sep, "/")
+            files.append((name.encode("utf-8"), fullPath))
+
+    indexSize = _header.size + sum(_nameLen.size + len(name) + _entry.size for name, _ in files)
+    entries = []
+    offset = indexSize
+    for name, fullPath in files:
+        length = os.path.getsize(fullPath)
+        entries.append((name, fullPath, offset, length))
+        offset += length
+
+    tmpPath = str(bundlePath) + ".tmp"
+    with open(tmpPath, "wb") as f:
+        f.write(_header.pack(MAGIC, VERSION, len(entries)))
+        for name, fullPath, offset, length in entries:
+            f.write(_nameLen.pack(len(name)))
+            f.write(name)
+            f.write(_entry.pack(offset, length))
+        for name, fullPath, offset, length in entries:
+            with open(fullPath, "rb") as src:
+                f.write(src.read(length))
+    if os.path.exists(str(bundlePath)):
+        os.remove(str(bundlePath))
+    os.rename(tmpPath, str(bundlePath))
+
+    return len(entries)
+
+
+class IconBundle(object):
+    """read-only, memory mapped view of a bundle file.
+
+    entries are addressed by their name relative to the packed directory, or through the virtual
+    path ``<bundlePath>/<name>`` that IconManager hands out for them.
+    """
+    mounted = {}
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._entries = {}
+        self._readIndex()
+
+    def _readIndex(self):
+        magic, version, count = _header.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{0} is not a qqt icon bundle.".format(self.path))
+
+        pos = _header.size
+        for _ in range(count):
+            nameLen, = _nameLen.unpack_from(self._map, pos)
+            pos += _nameLen.size
+            name = self._map[pos:pos + nameLen].decode("utf-8")
+            pos += nameLen
+            self._entries[name] = _entry.unpack_from(self._map, pos)
+            pos += _entry.size
+
+    @classmethod
+    def mount(cls, path):
+        path = str(path)
+        bundle = cls.mounted.get(path)
+        if bundle is None:
+            bundle = cls.mounted[path] = cls(path)
+        return bundle
+
+    @classmethod
+    def find(cls, path):
+        """return (bundle, name) for a virtual path inside a mounted bundle, else None."""
+        path = str(path)
+        for bundlePath, bundle in cls.mounted.items():
+            if path.startswith(bundlePath + "/"):
+                name = path[len(bundlePath) + 1:]
+                if name in bundle:
+                    return bundle, name
+        return None
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def names(self):
+        return list(self._entries)
+
+    def virtualPath(self, name):
+        return self.path + "/" + name
+
+    def data(self, name):
+        """zero-copy memoryview of the stored file."""
+        offset, length = self._entries[name]
+        return memoryview(self._map)[offset:offset + length]
+
+    def image(self, name):
+        data = self.data(name)
+        try:
+            return QtGui.QImage.fromData(data)
+        except TypeError:
+            # bindings that only take bytes/QByteArray need one copy of the (small) file.
+            return QtGui.QImage.fromData(data.tobytes())
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+        self.mounted.pop(self.path, None)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        sys.stderr.write("usage: python -m qqt.resources.bundle <iconDir> <bundle{0}>\n".format(EXTENSION))
+        return 1
+    count = packBundle(argv[0], argv[1])
+    sys.stdout.write("packed {0} icons into {1}\n".format(count, argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+from Qt import QtGui
+
+
+def imageBytes(image):
+    """approximate decoded size in bytes of a QPixmap, QImage or QIcon."""
+    if isinstance(image, (QtGui.QPixmap, QtGui.QImage)):
+        if image.isNull():
+            return 0
+        return image.width() * image.height() * max(image.depth(), 8) // 8
+    elif isinstance(image, QtGui.QIcon):
+        return sum(size.width() * size.height() * 4 for size in image.availableSizes())
+    return 0
+
+
+class LRUCache(object):
+    """least recently used cache bounded by the total byte cost of its entries."""
+
+    def __init__(self, maxBytes=64 * 1024 * 1024, costFunc=imageBytes):
+        self._entries = OrderedDict()
+        self._costFunc = costFunc
+        self.maxBytes = maxBytes
+        self.totalBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.listener = None
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        """the keys of all entries, least recently used first."""
+        return list(self._entries)
+
+    def get(self, key, default=None):
+        value = self.lookup(key, self)
+        if value is self:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def lookup(self, key, default=None):
+        """like get(), but not counted as a hit or miss. for lookups made on behalf of another get()."""
+        try:
+            value, cost = self._entries.pop(key)
+        except KeyError:
+            return default
+        self._entries[key] = (value, cost)
+        return value
+
+    def put(self, key, value, cost=None):
+        """store value, charged cost bytes (default: costFunc(value)). returns value."""
+        self.discard(key)
+        if cost is None:
+            cost = self._costFunc(value)
+        if cost > self.maxBytes:
+            return value
+        self._entries[key] = (value, cost)
+        self.totalBytes += cost
+        self.trim(self.maxBytes)
+        if self.listener is not None:
+            self.listener()
+        return value
+
+    def discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.totalBytes -= entry[1]
+
+    def trim(self, maxBytes):
+        while self._entries and self.totalBytes > maxBytes:
+            key, (value, cost) = self._entries.popitem(last=False)
+            self.totalBytes -= cost
+            self.evictions += 1
+
+    def setMaxBytes(self, maxBytes):
+        self.maxBytes = maxBytes
+        self.trim(maxBytes)
+
+    def clear(self):
+        self._entries.clear()
+        self.totalBytes = 0
+
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {"entries": len(self._entries),
+                "bytes": self.totalBytes,
+                "maxBytes": self.maxBytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions}
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+
+from Qt import QtGui
+
+from .bundle import IconBundle
+
+_replace = getattr(os, "replace", os.rename)
+# bumped whenever the scaling of cached entries changes, so stale entries are never reused.
+_keyVersion = 3
+
+
+class DiskCache(object):
+    """on-disk cache of scaled images, shared by every process using the same directory.
+
+    entries are png files named after a hash of the source path, its mtime and size, and the
+    requested scaling. writes go through a temp file and an atomic rename, so concurrent readers
+    never see partial files. the file mtime doubles as the LRU timestamp.
+    """
+    shared = None
+
+    def __init__(self, path=None, maxBytes=256 * 1024 * 1024):
+        self.path = path or os.path.join(os.path.expanduser("~"), ".cache", "qqt", "pixmaps")
+        self.maxBytes = maxBytes
+        self._bytesSinceTrim = 0
+        self._lock = threading.Lock()
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                # another process created it in the meantime.
+                pass
+
+    @classmethod
+    def enable(cls, path=None, maxBytes=256 * 1024 * 1024):
+        """use a disk cache for every scaled lib.readImage / lib.pixmap / IconManager load."""
+        cls.shared = cls(path=path, maxBytes=maxBytes)
+        return cls.shared
+
+    @classmethod
+    def disable(cls):
+        cls.shared = None
+
+    def key(self, sourcePath, w, h, aspectRatioMode, transformMode, fit=False):
+        sourcePath = str(sourcePath)
+        statPath = sourcePath
+        entry = IconBundle.find(sourcePath)
+        if entry:
+            statPath = entry[0].path
+        try:
+            st = os.stat(statPath)
+        except OSError:
+            return None
+
+        raw = "|".join(str(part) for part in (_keyVersion, os.path.abspath(sourcePath), st.st_mtime,
+                                              st.st_size, w, h, int(aspectRatioMode), int(transformMode), bool(fit)))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _entryPath(self, key):
+        return os.path.join(self.path, key + ".png")
+
+    def load(self, key):
+        entryPath = self._entryPath(key)
+        image = QtGui.QImage()
+        if not image.load(entryPath, "PNG"):
+            return None
+        try:
+            os.utime(entryPath, None)
+        except OSError:
+            pass
+        return image
+
+    def store(self, key, image):
+        if image.isNull():
+            return
+        entryPath = self._entryPath(key)
+        tmpPath = "{0}.{1}.{2}.tmp".format(entryPath, os.getpid(), threading.current_thread().ident)
+        if not image.save(tmpPath, "PNG"):
+            return
+        try:
+            size = os.path.getsize(tmpPath)
+            _replace(tmpPath, entryPath)
+        except OSError:
+            try:
+                os.remove(tmpPath)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._bytesSinceTrim += size
+            needsTrim = self._bytesSinceTrim > self.maxBytes // 10
+            if needsTrim:
+                self._bytesSinceTrim = 0
+        if needsTrim:
+            self.trim()
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".png"):
+                continue
+            entryPath = os.path.join(self.path, name)
+            try:
+                st = os.stat(entryPath)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entryPath))
+        return entries
+
+    def totalBytes(self):
+        return sum(size for mtime, size, entryPath in self._entries())
+
+    def trim(self, maxBytes=None):
+        """delete least recently used entries until the cache fits into maxBytes."""
+        maxBytes = self.maxBytes if maxBytes is None else maxBytes
+        entries = sorted(self._entries())
+        total = sum(size for mtime, size, entryPath in entries)
+        for mtime, size, entryPath in entries:
+            if total <= maxBytes:
+                break
+            try:
+                os.remove(entryPath)
+            except OSError:
+                # already evicted by another process.
+                pass
+            total -= size
+
+    def clear(self):
+        self.trim(0)
@@ -1,5 +1,16 @@
+import json
+import math
+import os
+from contextlib import contextmanager
+
 from Qt import QtCore, QtGui
 
+from .bundle import IconBundle, isBundle
+from .cache import LRUCache
+from .loader import ImageLoader
+from .memory import ImageMemory
+from ..lib import pixmap, readImage
+
 try:
     from pathlib import Path
 except ImportError:
@@ -8,33 +19,440 @@ except ImportError:
 
 class IconManager(object):
     dirs = []
+    cache = LRUCache(maxBytes=32 * 1024 * 1024)
+    _index = None
+    # the index in use before the last invalidateIndex(), compared to the rebuilt one.
+    _staleIndex = None
+    _missing = set()
+    _watcher = None
+    _recorded = None
+    iconSetDir = os.path.join(os.path.expanduser("~"), ".cache", "qqt", "iconsets")
 
     @classmethod
     def get(cls, iconName, **kwargs):
+        """return iconName as a QIcon, QPixmap or path, depending on the "type" keyword.
+
+        a "size" (w, h) is a box the image is fitted inside, keeping its aspect ratio. with one,
+        icons carry one pixmap per screen device pixel ratio and pixmaps are
+        rendered for the "dpr" keyword (default: the application's device pixel ratio). "@2x" style
+        files next to the icon are used for those variants when they exist.
+        unsized icons take the "iconSize" (QSize or (w, h)) their widget shows them at: it is recorded,
+        and variants prefetched for it are added to the icon, so its first paint decodes nothing.
+        """
         itype = kwargs.get("type", "icon")
         size = kwargs.get("size", None)
+        if size:
+            size = tuple(size)
+        iconSize = kwargs.get("iconSize", None)
+        if isinstance(iconSize, QtCore.QSize):
+            iconSize = (iconSize.width(), iconSize.height())
+        elif iconSize:
+            iconSize = tuple(iconSize)
+        withPrefetched = itype == "icon" and not size and iconSize
 
-        iconPath = ""
-        icon = None
+        cls._record(iconName, itype, size, iconSize if withPrefetched else None)
 
-        for eachDir in cls.dirs:
-            checkPath = Path(eachDir) / iconName
-            if checkPath.exists():
-                iconPath = str(checkPath)
-                break
+        if itype == "icon" and size:
+            ratios = cls.devicePixelRatios()
+            key = (iconName, itype, size, ratios)
+        elif itype == "pixmap" and size:
+            # a sized pixmap is the variant itself.
+            key = (iconName, "variant", size, kwargs.get("dpr") or cls.devicePixelRatio())
+        else:
+            key = (iconName, itype, size)
+
+        if itype in ("icon", "pixmap"):
+            cached = cls.cache.get(key)
+            if cached is not None:
+                # hand out a shallow (implicitly shared) copy so callers can't alter the cached entry.
+                if withPrefetched:
+                    return cls._addPrefetched(QtGui.QIcon(cached), iconName, iconSize)
+                return type(cached)(cached)
+
+        iconPath = cls.resolve(iconName)
+        icon = None
 
         if itype == "icon":
-            icon = QtGui.QIcon(iconPath)
+            if size:
+                icon = QtGui.QIcon()
+                for dpr in ratios:
+                    icon.addPixmap(cls._variant(iconName, size, dpr))
+                # the bytes are charged to the variants, the icon only shares their pixmaps.
+                cls.cache.put(key, QtGui.QIcon(icon), cost=0)
+            else:
+                if IconBundle.find(iconPath):
+                    icon = QtGui.QIcon(pixmap(iconPath))
+                else:
+                    icon = QtGui.QIcon(iconPath)
+                cls.cache.put(key, QtGui.QIcon(icon))
+                if withPrefetched:
+                    icon = cls._addPrefetched(icon, iconName, iconSize)
 
         elif itype == "pixmap":
-            icon = QtGui.QPixmap(iconPath)
             if size:
-                icon = icon.scaled(size[0], size[1], aspectRatioMode=QtCore.Qt.KeepAspectRatio, transformMode=QtCore.Qt.SmoothTransformation)
+                icon = QtGui.QPixmap(cls._variant(iconName, size, key[-1]))
+            else:
+                icon = pixmap(iconPath)
+                cls.cache.put(key, QtGui.QPixmap(icon))
         elif itype == "path":
             icon = iconPath
 
         return icon
 
+    @classmethod
+    def _record(cls, iconName, itype, size, iconSize=None):
+        if cls._recorded is not None and itype in ("icon", "pixmap"):
+            cls._recorded.add((iconName, itype, size, iconSize))
+
+    @classmethod
+    def _addPrefetched(cls, icon, iconName, iconSize):
+        """add the variants cached for iconSize to the file based icon.
+
+        variants bigger than the file are left out, as the icon itself never scales up.
+        """
+        available = icon.availableSizes()
+        for dpr in cls.devicePixelRatios():
+            pix = cls.cache.lookup((iconName, "variant", iconSize, dpr))
+            if pix is None:
+                continue
+            if available and not any(each.width() >= pix.width() and each.height() >= pix.height()
+                                     for each in available):
+                continue
+            icon.addPixmap(pix)
+        return icon
+
+    @classmethod
+    def _variant(cls, iconName, size, dpr):
+        """pixmap of iconName for size logical pixels at dpr, rendered once and cached."""
+        key = (iconName, "variant", size, dpr)
+        # get() already counted this lookup.
+        pix = cls.cache.lookup(key)
+        if pix is not None:
+            return pix
+
+        image = readImage(cls._sourceFor(iconName, dpr), w=int(round(size[0] * dpr)), h=int(round(size[1] * dpr)),
+                          transformMode=QtCore.Qt.SmoothTransformation, fit=True)
+        pix = QtGui.QPixmap.fromImage(image)
+        pix.setDevicePixelRatio(dpr)
+        return cls.cache.put(key, pix)
+
+    @classmethod
+    def _sourceFor(cls, iconName, dpr):
+        """path of the best "@<n>x" file for dpr, falling back to iconName itself."""
+        root, ext = os.path.splitext(iconName)
+        for factor in range(int(math.ceil(dpr)), 1, -1):
+            iconPath = cls.resolve("{0}@{1}x{2}".format(root, factor, ext))
+            if iconPath:
+                return iconPath
+        return cls.resolve(iconName)
+
+    @classmethod
+    def devicePixelRatio(cls):
+        app = QtCore.QCoreApplication.instance()
+        if isinstance(app, QtGui.QGuiApplication):
+            return app.devicePixelRatio()
+        return 1.0
+
+    @classmethod
+    def devicePixelRatios(cls):
+        """sorted tuple of 1.0 and the device pixel ratios of all connected screens."""
+        ratios = set([1.0])
+        if isinstance(QtCore.QCoreApplication.instance(), QtGui.QGuiApplication):
+            for screen in QtGui.QGuiApplication.screens():
+                ratios.add(screen.devicePixelRatio())
+        return tuple(sorted(ratios))
+
+    @classmethod
+    def toIcon(cls, icon, size=None, iconSize=None):
+        """convert a QIcon, QPixmap, file path or registered icon name to a QIcon.
+
+        see get() for size and iconSize.
+        """
+        if isinstance(icon, QtGui.QIcon):
+            return icon
+        elif isinstance(icon, QtGui.QPixmap):
+            return QtGui.QIcon(icon)
+        if os.path.isfile(icon):
+            icon = os.path.abspath(icon)
+        return cls.get(icon, type="icon", size=size, iconSize=iconSize)
+
+    @classmethod
+    def getAsync(cls, iconName, callback, target=None, **kwargs):
+        """like get(), but decodes on a worker thread and passes the result to callback.
+
+        iconName may also be a file path. a cached result is passed to callback right away and
+        returned, otherwise a placeholder is returned. the decoded pixmap shares its cache entry
+        with get() and prefetch().
+        """
+        itype = kwargs.get("type", "icon")
+        size = kwargs.get("size", None)
+        if size:
+            size = tuple(size)
+
+        if itype not in ("icon", "pixmap"):
+            result = cls.get(iconName, **kwargs)
+            callback(result)
+            return result
+
+        if os.path.isfile(iconName):
+            iconName = os.path.abspath(iconName)
+        cls._record(iconName, itype, size)
+
+        dpr = (kwargs.get("dpr") or cls.devicePixelRatio()) if size else 1.0
+        key = (iconName, "variant", size, dpr) if size else (iconName, "pixmap", None)
+        wrap = QtGui.QIcon if itype == "icon" else QtGui.QPixmap
+        cached = cls.cache.get(key)
+        if cached is not None:
+            callback(wrap(cached))
+            return wrap(cached)
+
+        def _loaded(pix):
+            pix.setDevicePixelRatio(dpr)
+            cls.cache.put(key, QtGui.QPixmap(pix))
+            callback(wrap(pix))
+
+        w, h = size or (None, None)
+        if size:
+            w, h = int(round(w * dpr)), int(round(h * dpr))
+        ImageLoader.request(cls._sourceFor(iconName, dpr), _loaded, w=w, h=h, target=target,
+                            transformMode=QtCore.Qt.SmoothTransformation, fit=True)
+
+        placeholder = ImageLoader.placeholder(*(size or (16, 16)))
+        if itype == "icon":
+            return QtGui.QIcon(placeholder)
+        return placeholder
+
+    @classmethod
+    def prefetch(cls, names, sizes=None, itype="icon", iconSize=None):
+        """decode names at every size in the background, so later get() calls are cache hits.
+
+        requests are issued from the event loop a few at a time and decoded on the loader's thread pool.
+        unsized icons are decoded at iconSize, for get() calls passing the same iconSize; without
+        one they only warm the name index, as QIcon decodes files lazily on first paint.
+        """
+        sizes = [tuple(size) if size else None for size in (sizes or [None])]
+        iconSize = tuple(iconSize) if iconSize else None
+        cls._prefetchEntries([(name, itype, size, iconSize) for name in names for size in sizes])
+
+    @classmethod
+    def _prefetchEntries(cls, entries, chunkSize=20):
+        entries = list(entries)
+
+        def _step():
+            for iconName, itype, size, iconSize in entries[:chunkSize]:
+                cls._prefetchOne(iconName, itype, size, iconSize)
+            del entries[:chunkSize]
+            if entries:
+                QtCore.QTimer.singleShot(0, _step)
+
+        if entries:
+            QtCore.QTimer.singleShot(0, _step)
+
+    @classmethod
+    def _prefetchOne(cls, iconName, itype, size, iconSize=None):
+        if itype == "icon" and not size:
+            size = iconSize
+        if not size:
+            iconPath = cls.resolve(iconName)
+            key = (iconName, "pixmap", None)
+            if itype == "pixmap" and iconPath and key not in cls.cache:
+                ImageLoader.request(iconPath, lambda pix: cls.cache.put(key, pix))
+            return
+
+        ratios = cls.devicePixelRatios() if itype == "icon" else (cls.devicePixelRatio(),)
+        for dpr in ratios:
+            key = (iconName, "variant", size, dpr)
+            if key in cls.cache:
+                continue
+
+            def _loaded(pix, key=key, dpr=dpr):
+                pix.setDevicePixelRatio(dpr)
+                cls.cache.put(key, pix)
+
+            ImageLoader.request(cls._sourceFor(iconName, dpr), _loaded, w=int(round(size[0] * dpr)),
+                                h=int(round(size[1] * dpr)), transformMode=QtCore.Qt.SmoothTransformation,
+                                fit=True)
+
+    @classmethod
+    @contextmanager
+    def recording(cls, panelName=None):
+        """record every (name, type, size, iconSize) looked up inside the block, saved as panelName's icon set.
+
+        on the next launch, replay(panelName) prefetches that set before the panel is shown::
+
+            IconManager.replay("assetBrowser")
+            with IconManager.recording("assetBrowser"):
+                ui = AssetBrowser()
+        """
+        previous = cls._recorded
+        cls._recorded = set()
+        try:
+            yield cls._recorded
+        finally:
+            recorded = cls._recorded
+            cls._recorded = previous
+            if previous is not None:
+                previous.update(recorded)
+            if panelName:
+                cls.saveIconSet(panelName, recorded)
+
+    @classmethod
+    def iconSetPath(cls, panelName):
+        return os.path.join(cls.iconSetDir, panelName + ".json")
+
+    @classmethod
+    def saveIconSet(cls, panelName, entries):
+        if not os.path.isdir(cls.iconSetDir):
+            os.makedirs(cls.iconSetDir)
+        data = [[iconName, itype, list(size) if size else None, list(iconSize) if iconSize else None]
+                for iconName, itype, size, iconSize in sorted(entries, key=str)]
+        with open(cls.iconSetPath(panelName), "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def loadIconSet(cls, panelName):
+        try:
+            with open(cls.iconSetPath(panelName)) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return []
+        # sets saved before iconSize was recorded have three fields.
+        entries = []
+        for entry in data:
+            iconName, itype, size = entry[:3]
+            iconSize = entry[3] if len(entry) > 3 else None
+            entries.append((iconName, itype, tuple(size) if size else None, tuple(iconSize) if iconSize else None))
+        return entries
+
+    @classmethod
+    def replay(cls, panelName):
+        """prefetch the icon set recorded for panelName. returns the number of entries."""
+        entries = cls.loadIconSet(panelName)
+        cls._prefetchEntries(entries)
+        return len(entries)
+
+    @classmethod
+    def resolve(cls, iconName):
+        """return the path of iconName in the first dir that has it, or an empty string.
+
+        names found in a bundle resolve to the virtual path "<bundlePath>/<iconName>".
+        """
+        if cls._index is None:
+            cls._buildIndex()
+
+        iconPath = cls._index.get(iconName)
+        if iconPath is not None:
+            return iconPath
+        if iconName in cls._missing:
+            return ""
+
+        # nested names like "sub/icon.png" are not part of the flat index.
+        iconPath = ""
+        if os.path.isabs(iconName):
+            if os.path.exists(iconName):
+                iconPath = iconName
+        elif "/" in iconName or os.sep in iconName:
+            for eachDir in cls.dirs:
+                if str(eachDir) in IconBundle.mounted:
+                    continue
+                checkPath = Path(eachDir) / iconName
+                if checkPath.exists():
+                    iconPath = str(checkPath)
+                    break
+
+        if iconPath:
+            cls._index[iconName] = iconPath
+        else:
+            cls._missing.add(iconName)
+        return iconPath
+
+    @classmethod
+    def _buildIndex(cls):
+        index = {}
+        for eachDir in cls.dirs:
+            if str(eachDir) in IconBundle.mounted:
+                bundle = IconBundle.mounted[str(eachDir)]
+                for name in bundle.names():
+                    if name not in index:
+                        index[name] = bundle.virtualPath(name)
+                continue
+
+            try:
+                names = os.listdir(str(eachDir))
+            except OSError:
+                continue
+            for name in names:
+                if name not in index:
+                    index[name] = str(Path(eachDir) / name)
+
+        stale, cls._staleIndex = cls._staleIndex, None
+        cls._index = index
+        cls._missing = set()
+        if stale is not None:
+            # absolute paths don't depend on the dirs.
+            cls._evict(name for name in set(stale) | set(index)
+                       if stale.get(name) != index.get(name) and not os.path.isabs(name))
+        cls._watchDirs()
+
+    @classmethod
+    def _evict(cls, names):
+        """drop the cached images of names, and of the base names of "@<n>x" names."""
+        names = set(names)
+        for name in list(names):
+            root, ext = os.path.splitext(name)
+            base, sep, factor = root.rpartition("@")
+            if sep and factor.endswith("x") and factor[:-1].isdigit():
+                names.add(base + ext)
+        for key in cls.cache.keys():
+            if key[0] in names:
+                cls.cache.discard(key)
+
+    @classmethod
+    def _watchDirs(cls):
+        if cls._watcher is None:
+            if QtCore.QCoreApplication.instance() is None:
+                return
+            cls._watcher = QtCore.QFileSystemWatcher()
+            cls._watcher.directoryChanged.connect(cls.invalidateIndex)
+
+        watched = set(cls._watcher.directories())
+        wanted = set(str(eachDir) for eachDir in cls.dirs if os.path.isdir(str(eachDir)))
+        if watched - wanted:
+            cls._watcher.removePaths(sorted(watched - wanted))
+        if wanted - watched:
+            cls._watcher.addPaths(sorted(wanted - watched))
+
+    @classmethod
+    def invalidateIndex(cls, *args):
+        """forget the name index and the names known to be missing.
+
+        cached images are kept: when the index is rebuilt, only names that resolve to another file
+        (or now resolve at all) are evicted.
+        """
+        if cls._index is not None:
+            cls._staleIndex = cls._index
+        cls._index = None
+        cls._missing = set()
+
     @classmethod
     def addDir(cls, dirPath):
+        """register an icon directory, or a bundle file written by qqt.resources.bundle.packBundle."""
+        if isBundle(dirPath):
+            IconBundle.mount(dirPath)
         cls.dirs.append(dirPath)
+        cls.invalidateIndex()
+
+    @classmethod
+    def clearCache(cls):
+        cls.cache.clear()
+
+    @classmethod
+    def setCacheLimit(cls, maxBytes):
+        cls.cache.setMaxBytes(maxBytes)
+
+    @classmethod
+    def cacheStats(cls):
+        return cls.cache.stats()
+
+
+ImageMemory.registerCache("IconManager", IconManager.cache)
@@ -0,0 +1,120 @@
+from functools import partial
+
+from Qt import QtCore, QtGui
+
+from ..lib import readImage
+
+
+class _Relay(QtCore.QObject):
+    finished = QtCore.Signal(object, object)
+
+
+class _DecodeTask(QtCore.QRunnable):
+    def __init__(self, key, relay):
+        super(_DecodeTask, self).__init__()
+        self.key = key
+        self.relay = relay
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+        path, w, h, aspectRatioMode, transformMode, fit = self.key
+        image = readImage(path, w=w, h=h, aspectRatioMode=aspectRatioMode, transformMode=transformMode, fit=fit)
+        try:
+            self.relay.finished.emit(self.key, image)
+        except RuntimeError:
+            # the relay was deleted, the interpreter is shutting down.
+            pass
+
+
+class ImageLoader(object):
+    """decodes images on a QThreadPool and hands the resulting QPixmap to callbacks on the GUI thread.
+
+    identical requests that are in flight share one decode. callbacks registered with a target
+    QObject are dropped when the target is destroyed, and a decode nobody waits for is cancelled.
+    decodes that haven't started when the application quits are cancelled too.
+    """
+    _relay = None
+    _pending = {}
+    _tasks = {}
+    _watchedTargets = set()
+    _placeholders = {}
+
+    @classmethod
+    def request(cls, path, callback, w=None, h=None, target=None,
+                aspectRatioMode=QtCore.Qt.KeepAspectRatio, transformMode=QtCore.Qt.FastTransformation, fit=False):
+        key = (str(path), w, h, aspectRatioMode, transformMode, fit)
+        targetId = cls._watch(target)
+        cls._pending.setdefault(key, []).append((callback, targetId))
+
+        if key not in cls._tasks:
+            task = _DecodeTask(key, cls._getRelay())
+            cls._tasks[key] = task
+            QtCore.QThreadPool.globalInstance().start(task)
+
+    @classmethod
+    def placeholder(cls, w, h):
+        """cheap transparent pixmap shown until the real image arrives."""
+        w, h = max(int(w or 1), 1), max(int(h or 1), 1)
+        pix = cls._placeholders.get((w, h))
+        if pix is None:
+            pix = QtGui.QPixmap(w, h)
+            pix.fill(QtCore.Qt.transparent)
+            cls._placeholders[(w, h)] = pix
+        return QtGui.QPixmap(pix)
+
+    @classmethod
+    def pendingCount(cls):
+        return len(cls._tasks)
+
+    @classmethod
+    def _getRelay(cls):
+        if cls._relay is None:
+            cls._relay = _Relay()
+            cls._relay.finished.connect(cls._finished)
+            app = QtCore.QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(cls.cancelAll)
+        return cls._relay
+
+    @classmethod
+    def cancelAll(cls):
+        """drop every pending callback and cancel the decodes that haven't started yet."""
+        for task in cls._tasks.values():
+            task.cancelled = True
+        cls._tasks.clear()
+        cls._pending.clear()
+
+    @classmethod
+    def _watch(cls, target):
+        if target is None:
+            return None
+        targetId = id(target)
+        if targetId not in cls._watchedTargets:
+            cls._watchedTargets.add(targetId)
+            target.destroyed.connect(partial(cls._targetDestroyed, targetId))
+        return targetId
+
+    @classmethod
+    def _targetDestroyed(cls, targetId, *args):
+        cls._watchedTargets.discard(targetId)
+        for key in list(cls._pending):
+            callbacks = [each for each in cls._pending[key] if each[1] != targetId]
+            if callbacks:
+                cls._pending[key] = callbacks
+            else:
+                del cls._pending[key]
+                task = cls._tasks.pop(key, None)
+                if task is not None:
+                    task.cancelled = True
+
+    @classmethod
+    def _finished(cls, key, image):
+        cls._tasks.pop(key, None)
+        callbacks = cls._pending.pop(key, [])
+        if not callbacks:
+            return
+        pix = QtGui.QPixmap.fromImage(image)
+        for callback, targetId in callbacks:
+            callback(QtGui.QPixmap(pix))
@@ -0,0 +1,108 @@
+import sys
+import weakref
+from functools import partial
+
+from .cache import imageBytes
+
+
+class ImageMemory(object):
+    """registry of the decoded image memory held by qqt caches and widgets.
+
+    widgets report their pixmaps with track(), caches are registered with registerCache(). with a
+    budget set, going over it first trims the caches (least recently used entries first) and then
+    downgrades Image widgets that were shown and hidden again to thumbnails until usage fits.
+    implicitly shared pixmaps are counted once per holder, so the totals are an upper bound.
+    """
+    budget = None
+    thumbnailSize = 64
+    _caches = {}
+    _owners = {}
+    _images = weakref.WeakValueDictionary()
+    _enforcing = False
+
+    @classmethod
+    def registerCache(cls, name, cache):
+        cls._caches[name] = cache
+        cache.listener = cls.check
+
+    @classmethod
+    def track(cls, owner, image):
+        """record the bytes of image (QPixmap, QImage or QIcon) as held by the QObject owner."""
+        category = type(owner).__name__
+        key = id(owner)
+        entries = cls._owners.setdefault(category, {})
+        if key not in entries:
+            owner.destroyed.connect(partial(cls._untrack, category, key))
+        entries[key] = imageBytes(image)
+
+        if hasattr(owner, "downgrade"):
+            cls._images[key] = owner
+        cls.check()
+
+    @classmethod
+    def untrack(cls, owner):
+        cls._untrack(type(owner).__name__, id(owner))
+
+    @classmethod
+    def _untrack(cls, category, key, *args):
+        cls._owners.get(category, {}).pop(key, None)
+        cls._images.pop(key, None)
+
+    @classmethod
+    def usage(cls):
+        """bytes per owner: one entry per registered cache and per tracked widget class."""
+        result = dict((name, cache.totalBytes) for name, cache in cls._caches.items())
+        for category, entries in cls._owners.items():
+            result[category] = result.get(category, 0) + sum(entries.values())
+        return result
+
+    @classmethod
+    def total(cls):
+        return sum(cls.usage().values())
+
+    @classmethod
+    def dump(cls, stream=None):
+        stream = stream or sys.stdout
+        usage = cls.usage()
+        for owner in sorted(usage, key=usage.get, reverse=True):
+            count = len(cls._owners.get(owner, {})) or len(cls._caches.get(owner, ()))
+            stream.write("{0:<30} {1:>8} {2:>12.1f} KB\n".format(owner, count, usage[owner] / 1024.0))
+        budget = "-" if cls.budget is None else "{0:.1f} KB".format(cls.budget / 1024.0)
+        stream.write("{0:<30} {1:>8} {2:>12.1f} KB (budget {3})\n".format("total", "", cls.total() / 1024.0, budget))
+
+    @classmethod
+    def setBudget(cls, maxBytes):
+        cls.budget = maxBytes
+        cls.check()
+
+    @classmethod
+    def check(cls):
+        if cls.budget is not None and not cls._enforcing and cls.total() > cls.budget:
+            cls.enforce()
+
+    @classmethod
+    def enforce(cls):
+        if cls.budget is None:
+            return
+        cls._enforcing = True
+        try:
+            excess = cls.total() - cls.budget
+            for cache in cls._caches.values():
+                if excess <= 0:
+                    break
+                before = cache.totalBytes
+                cache.trim(max(before - excess, 0))
+                excess -= before - cache.totalBytes
+
+            images = sorted(cls._images.values(), key=lambda image: cls._owners.get(
+                type(image).__name__, {}).get(id(image), 0), reverse=True)
+            for image in images:
+                if excess <= 0:
+                    break
+                if not image.isOffscreen():
+                    continue
+                before = cls._owners.get(type(image).__name__, {}).get(id(image), 0)
+                image.downgrade(cls.thumbnailSize)
+                excess -= before - cls._owners.get(type(image).__name__, {}).get(id(image), 0)
+        finally:
+            cls._enforcing = False
@@ -0,0 +1,214 @@
+"""declarative qqt ui specs.
+
+a spec is a dict (or json file) describing a widget tree::
+
+    {"class": "VBoxLayout", "children": [
+        {"class": "StringField", "name": "nameField", "kwargs": {"label": "name"}},
+        {"class": "HBoxLayout", "children": [
+            {"class": "Button", "name": "okBtn", "args": ["ok"]},
+            {"class": "Button", "name": "cancelBtn", "args": ["cancel"]}]},
+        {"class": "FrameWidget", "kwargs": {"title": "options"}, "layout": "contentLayout", "children": [...]}]}
+
+"class" is a qqt.gui / QtWidgets class name or a dotted import path. "layout" names the node's child
+container: a (capitalized) layout class to install on the widget, or the attribute holding an existing
+layout. it defaults to the widget's layout().
+build() compiles each spec once into a flat python routine (no qcreate dispatch per node), which is
+cached in memory and on disk by spec hash.
+"""
+import hashlib
+import importlib
+import json
+import marshal
+import os
+import sys
+
+from .base import QtWidgets
+
+COMPILER_VERSION = 3
+
+cacheDir = os.path.join(os.path.expanduser("~"), ".cache", "qqt", "specs")
+_compiled = {}
+
+
+def loadSpec(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def specHash(spec):
+    raw = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def resolveClass(name):
+    if "." in name:
+        moduleName, className = name.rsplit(".", 1)
+        return getattr(importlib.import_module(moduleName), className)
+
+    from . import gui
+    cls = getattr(gui, name, None) or getattr(QtWidgets, name, None)
+    if cls is None:
+        raise ValueError("unknown class in ui spec: {0}".format(name))
+    return cls
+
+
+def _flatten(spec):
+    """depth first list of (node, parentIndex)."""
+    nodes = []
+
+    def _walk(node, parentIndex):
+        nodes.append((node, parentIndex))
+        index = len(nodes) - 1
+        for child in node.get("children", ()):
+            _walk(child, index)
+
+    _walk(spec, None)
+    return nodes
+
+
+def _kind(cls):
+    from .layouts import LayoutMixin
+    if issubclass(cls, QtWidgets.QSpacerItem):
+        return "spacer"
+    elif issubclass(cls, QtWidgets.QLayout):
+        return "layout"
+    elif issubclass(cls, LayoutMixin):
+        return "container"
+    return "widget"
+
+
+def compileSpec(spec):
+    """python source of the construction routine for spec."""
+    from .widgets.base import LabelMixin
+
+    nodes = _flatten(spec)
+    lines = ["def build(parent, C, A, K, L):", "    R = {}"]
+    containers = {}
+
+    for index, (node, parentIndex) in enumerate(nodes):
+        cls = resolveClass(node["class"])
+        kind = _kind(cls)
+        var = "n{0}".format(index)
+        call = "C[{0}](*A[{0}], **K[{0}])".format(index)
+
+        if parentIndex is None and kind == "layout":
+            lines.append("    {0} = C[{1}](parent, *A[{1}], **K[{1}]) if parent is not None else {2}".format(
+                var, index, call))
+        else:
+            lines.append("    {0} = {1}".format(var, call))
+
+        labelled = issubclass(cls, LabelMixin) and node.get("kwargs", {}).get("label") is not None
+        if labelled:
+            # a container widget, or a layout in painted label mode.
+            lines.append("    {0}C = {0}.labelContainer()".format(var))
+
+        if parentIndex is None and kind != "layout":
+            lines.append("    if parent is not None:")
+            lines.append("        if parent.layout() is not None:")
+            if labelled:
+                lines.append("            (parent.layout().addWidget if {0}C.isWidgetType() else "
+                             "parent.layout().addLayout)({0}C)".format(var))
+                lines.append("        elif {0}C.isWidgetType():".format(var))
+                lines.append("            {0}C.setParent(parent)".format(var))
+            else:
+                lines.append("            parent.layout().{0}({1})".format("addItem" if kind == "spacer" else "addWidget", var))
+                if kind != "spacer":
+                    lines.append("        else:")
+                    lines.append("            {0}.setParent(parent)".format(var))
+
+        if parentIndex is not None:
+            container = containers[parentIndex]
+            if kind == "spacer":
+                lines.append("    {0}.addItem({1})".format(container, var))
+            elif kind == "layout":
+                lines.append("    {0}.addLayout({1})".format(container, var))
+            elif labelled and _kind(resolveClass(nodes[parentIndex][0]["class"])) == "container":
+                # LayoutMixin widgets like Form decide themselves what to do with the label.
+                lines.append("    {0}.add({1})".format(container, var))
+            elif labelled:
+                lines.append("    ({0}.addWidget if {1}C.isWidgetType() else {0}.addLayout)({1}C)".format(container, var))
+            else:
+                lines.append("    {0}.addWidget({1})".format(container, var))
+
+        layout = node.get("layout")
+        if node.get("children") and kind in ("layout", "container"):
+            containers[index] = var
+        elif node.get("children") or layout:
+            if layout and layout[0].isupper():
+                lines.append("    {0}L = L[{1}]({0})".format(var, index))
+            elif layout:
+                lines.append("    {0}L = {0}.{1}".format(var, layout))
+            else:
+                lines.append("    {0}L = {0}.layout()".format(var))
+            containers[index] = var + "L"
+
+        if node.get("name"):
+            lines.append("    R[{0!r}] = {1}".format(node["name"], var))
+
+    lines.append("    R[None] = n0")
+    lines.append("    return R")
+    return "\n".join(lines) + "\n"
+
+
+def _cachePath(key):
+    tag = "{0}{1}".format(*sys.version_info[:2])
+    return os.path.join(cacheDir, "{0}.v{1}.py{2}.marshal".format(key, COMPILER_VERSION, tag))
+
+
+def _loadRoutine(spec):
+    key = specHash(spec)
+    routine = _compiled.get(key)
+    if routine is not None:
+        return routine
+
+    code = None
+    cachePath = _cachePath(key)
+    try:
+        with open(cachePath, "rb") as f:
+            code = marshal.load(f)
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        pass
+
+    if code is None:
+        code = compile(compileSpec(spec), "<qqt spec {0}>".format(key), "exec")
+        try:
+            if not os.path.isdir(cacheDir):
+                os.makedirs(cacheDir)
+            tmpPath = "{0}.{1}.tmp".format(cachePath, os.getpid())
+            with open(tmpPath, "wb") as f:
+                marshal.dump(code, f)
+            getattr(os, "replace", os.rename)(tmpPath, cachePath)
+        except (IOError, OSError):
+            pass
+
+    namespace = {}
+    exec(code, namespace)
+    routine = _compiled[key] = namespace["build"]
+    return routine
+
+
+def build(spec, parent=None, owner=None):
+    """build spec, attaching the root to parent. returns {name: object}, with the root under None.
+
+    named objects are also set as attributes on owner when given.
+    """
+    if not isinstance(spec, dict):
+        spec = loadSpec(spec)
+
+    nodes = _flatten(spec)
+    classes, args, kwargs, layoutClasses = [], [], [], {}
+    for index, (node, parentIndex) in enumerate(nodes):
+        classes.append(resolveClass(node["class"]))
+        args.append(node.get("args", ()))
+        kwargs.append(dict(node.get("kwargs", {})))
+        layout = node.get("layout")
+        if layout and layout[0].isupper():
+            layoutClasses[index] = resolveClass(layout)
+
+    result = _loadRoutine(spec)(parent, classes, args, kwargs, layoutClasses)
+
+    if owner is not None:
+        for name, obj in result.items():
+            if name is not None:
+                setattr(owner, name, obj)
+    return result
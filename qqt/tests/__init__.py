@@ -0,0 +1,8 @@
+import os
+
+
+def application():
+    """the QApplication shared by the unit tests, offscreen unless a platform is set."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from qqt.base import QtWidgets
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,348 @@
+"""headless construction / show / paint benchmark of qqt widgets.
+
+    QT_QPA_PLATFORM=offscreen python -m qqt.tests.benchmark [--repeat 3] [--cases TextList]
+        [--rows 1000,100000,1000000] [--output results.json] [--baseline baseline.json] [--tolerance 0.25]
+
+every case builds its widgets into a fresh host window and records, as the median over --repeat runs:
+construction time, first show (polish + layout) time, paint time, resident memory delta, the number
+of QObjects in the host and the LayoutRequest events a batched `with` block dropped. the
+LayoutRequest events delivered during construction and first show are counted in one extra, untimed
+run. with --baseline, metrics that grew past the tolerance are reported and the exit code is 1.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import Qt
+
+from qqt.base import QtCore, QtGui, QtWidgets, currentParent, qcreate
+from qqt.layouts import HBoxLayout, LayoutMixin, VBoxLayout
+
+TIME_METRICS = ("constructMs", "showMs", "paintMs")
+# differences below these are noise, whatever the tolerance says.
+ABSOLUTE_FLOORS = {"constructMs": 1.0, "showMs": 1.0, "paintMs": 1.0, "memoryKb": 1024, "qobjects": 0,
+                   "layoutRequests": 0, "relayoutsAvoided": 0}
+
+_timer = getattr(time, "perf_counter", time.time)
+
+
+def _rssKb():
+    """current resident set size in KB, or peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (IOError, OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _icon():
+    pix = QtGui.QPixmap(30, 30)
+    pix.fill(QtGui.QColor(90, 140, 200))
+    return pix
+
+
+class _EventCounter(QtCore.QObject):
+    """application event filter counting the events of one type."""
+
+    def __init__(self, eventType):
+        super(_EventCounter, self).__init__()
+        self.eventType = eventType
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == self.eventType:
+            self.count += 1
+        return False
+
+
+def stringFields(count=50, labelMode="widget"):
+    from qqt.widgets.inputs import StringField
+
+    def build():
+        for idx in range(count):
+            qcreate(StringField, label="field {0}".format(idx), labelMode=labelMode)
+    return build
+
+
+def batchedStringFields(count=50, attached=True):
+    """the fields built in a batched block, in a layout already in the host or attached afterwards."""
+    from qqt.widgets.inputs import StringField
+
+    def build():
+        layout = qcreate(VBoxLayout) if attached else VBoxLayout()
+        with layout.batched():
+            for idx in range(count):
+                qcreate(StringField, label="field {0}".format(idx))
+        if not attached:
+            currentParent().addLayout(layout)
+    return build
+
+
+def formFields(count=50, labelMode="painted"):
+    from qqt.widgets.displays import Form
+    from qqt.widgets.inputs import StringField
+
+    def build():
+        with qcreate(Form, labelMode=labelMode):
+            for idx in range(count):
+                qcreate(StringField, label="field {0}".format(idx))
+    return build
+
+
+def floatSliderFields(count=50, labelMode="widget"):
+    from qqt.widgets.inputs import FloatSliderField
+
+    def build():
+        for idx in range(count):
+            qcreate(FloatSliderField, label="slider {0}".format(idx), labelMode=labelMode)
+    return build
+
+
+def comboBoxes(count=20, items=200):
+    from qqt.widgets.inputs import ComboBox
+    names = ["item {0}".format(idx) for idx in range(items)]
+
+    def build():
+        for idx in range(count):
+            combo = qcreate(ComboBox, label="combo {0}".format(idx))
+            for name in names:
+                combo.addItem(name)
+    return build
+
+
+def comboBoxSetItems(count=20000):
+    from qqt.widgets.inputs import ComboBox
+    names = ["asset_{0}".format(idx) for idx in range(count)]
+
+    def build():
+        combo = qcreate(ComboBox, label="assets")
+        combo.setItems(names)
+        combo.setValueFromData(names[-1])
+    return build
+
+
+def comboBoxProviders(count=20, items=20000):
+    from qqt.widgets.inputs import ComboBox
+    names = ["asset_{0}".format(idx) for idx in range(items)]
+
+    def build():
+        for idx in range(count):
+            combo = qcreate(ComboBox, label="assets {0}".format(idx), provider=lambda: names)
+            combo.setCurrentItem(names[idx])
+    return build
+
+
+def frameWidgets(count=20, children=5):
+    from qqt.widgets.displays import FrameWidget
+    from qqt.widgets.inputs import Button
+
+    def build():
+        for idx in range(count):
+            frame = qcreate(FrameWidget, title="frame {0}".format(idx))
+            with frame.contentLayout:
+                for child in range(children):
+                    qcreate(Button, "button {0}".format(child))
+    return build
+
+
+def textList(rows):
+    from qqt.widgets.listview import TextList
+    names = ["row {0}".format(idx) for idx in range(rows)]
+
+    def build():
+        qcreate(TextList).initData(names)
+    return build
+
+
+def iconButtonGrid(columns, rows, label=False):
+    from qqt.widgets.inputs import IconButton
+    icon = _icon()
+
+    def build():
+        for row in range(rows):
+            with qcreate(HBoxLayout):
+                for column in range(columns):
+                    kwargs = {"label": "{0},{1}".format(row, column)} if label else {}
+                    qcreate(IconButton, icon, **kwargs)
+    return build
+
+
+def defaultCases(rowCounts=(1000, 100000, 1000000)):
+    """ordered (name, build function) pairs."""
+    cases = [
+        ("StringField x50", stringFields()),
+        ("StringField x50 painted labels", stringFields(labelMode="painted")),
+        ("StringField x50 in Form", formFields()),
+        ("StringField x50 batched", batchedStringFields()),
+        ("StringField x50 batched, unowned", batchedStringFields(attached=False)),
+        ("FloatSliderField x50", floatSliderFields()),
+        ("FloatSliderField x50 painted labels", floatSliderFields(labelMode="painted")),
+        ("ComboBox x20 (200 items)", comboBoxes()),
+        ("ComboBox setItems 20k", comboBoxSetItems()),
+        ("ComboBox x20 lazy provider (20k)", comboBoxProviders()),
+        ("FrameWidget x20 (5 buttons)", frameWidgets()),
+    ]
+    for rows in rowCounts:
+        cases.append(("TextList {0} rows".format(rows), textList(rows)))
+    cases += [
+        ("IconButton grid 10x10", iconButtonGrid(10, 10)),
+        ("IconButton grid 20x20", iconButtonGrid(20, 20)),
+        ("IconButton grid 10x10 labelled", iconButtonGrid(10, 10, label=True)),
+    ]
+    return cases
+
+
+def _flushDeletes(app):
+    app.processEvents()
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    gc.collect()
+
+
+def measureOnce(build, app):
+    """metrics of a single build into a fresh host window."""
+    _flushDeletes(app)
+    rssBefore = _rssKb()
+    avoidedBefore = LayoutMixin.batchStats["avoided"]
+
+    host = QtWidgets.QWidget()
+    host.resize(800, 600)
+    layout = VBoxLayout(host)
+
+    start = _timer()
+    with layout:
+        build()
+    constructed = _timer()
+
+    host.show()
+    app.processEvents()
+    shown = _timer()
+
+    host.repaint()
+    painted = _timer()
+
+    result = {"constructMs": (constructed - start) * 1000.0,
+              "showMs": (shown - constructed) * 1000.0,
+              "paintMs": (painted - shown) * 1000.0,
+              "memoryKb": max(_rssKb() - rssBefore, 0),
+              "qobjects": len(host.findChildren(QtCore.QObject)) + 1,
+              "relayoutsAvoided": LayoutMixin.batchStats["avoided"] - avoidedBefore}
+
+    host.close()
+    host.deleteLater()
+    _flushDeletes(app)
+    return result
+
+
+def countLayoutRequests(build, app):
+    """LayoutRequest events delivered while building into a fresh host window and showing it."""
+    _flushDeletes(app)
+    counter = _EventCounter(QtCore.QEvent.LayoutRequest)
+    host = QtWidgets.QWidget()
+    host.resize(800, 600)
+    layout = VBoxLayout(host)
+
+    app.installEventFilter(counter)
+    try:
+        with layout:
+            build()
+        host.show()
+        app.processEvents()
+    finally:
+        app.removeEventFilter(counter)
+
+    host.close()
+    host.deleteLater()
+    _flushDeletes(app)
+    return counter.count
+
+
+def measure(build, app, repeat=3):
+    """median of each metric over repeat builds, plus the layout requests of one more build."""
+    samples = [measureOnce(build, app) for _ in range(repeat)]
+    result = {}
+    for key in samples[0]:
+        values = sorted(sample[key] for sample in samples)
+        result[key] = values[len(values) // 2]
+    result["layoutRequests"] = countLayoutRequests(build, app)
+    return result
+
+
+def environment():
+    return {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "binding": Qt.__binding__,
+            "bindingVersion": Qt.__binding_version__,
+            "qtVersion": Qt.__qt_version__,
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results, baseline, tolerance=0.25):
+    """list of (case, metric, baseline value, value) that regressed against baseline results."""
+    regressions = []
+    for name, metrics in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for key, value in sorted(metrics.items()):
+            old = previous.get(key)
+            if old is None:
+                continue
+            if value - old > max(old * tolerance, ABSOLUTE_FLOORS.get(key, 0)):
+                regressions.append((name, key, old, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="*", default=None, help="only run cases whose name contains one of these")
+    parser.add_argument("--rows", default="1000,100000,1000000", help="comma separated TextList row counts")
+    parser.add_argument("--output", help="write results json here")
+    parser.add_argument("--baseline", help="results json to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth per metric")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    rowCounts = [int(rows) for rows in args.rows.split(",") if rows]
+    results = {}
+    for name, build in defaultCases(rowCounts):
+        if args.cases and not any(pattern in name for pattern in args.cases):
+            continue
+        metrics = results[name] = measure(build, app, args.repeat)
+        sys.stdout.write("{0:<34} construct {constructMs:>9.1f} ms  show {showMs:>8.1f} ms  "
+                         "paint {paintMs:>7.1f} ms  memory {memoryKb:>8} KB  qobjects {qobjects:>6}  "
+                         "layout requests {layoutRequests:>5} (avoided {relayoutsAvoided})\n"
+                         .format(name, **metrics))
+        sys.stdout.flush()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for name, key, old, value in regressions:
+            sys.stdout.write("REGRESSION {0}: {1} {2:.1f} -> {3:.1f}\n".format(name, key, old, value))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""import time of qqt entry points, each measured in a fresh interpreter.
+
+    python -m qqt.tests.import_benchmark [--repeat 5] [--breakdown]
+
+--breakdown adds the slowest qqt modules reported by `python -X importtime`.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+STATEMENTS = (
+    "import qqt",
+    "import qqt.gui",
+    "from qqt.gui import StringField",
+    "from qqt.gui import *",
+)
+
+_timer = "import time; _t = time.time(); {0}; sys.stdout.write(str(time.time() - _t))"
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    return env
+
+
+def measure(statement, repeat=5):
+    """median wall time in seconds of statement in a fresh interpreter, Qt itself preloaded."""
+    code = "import sys, Qt; " + _timer.format(statement)
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code], env=_env(), stderr=subprocess.STDOUT)
+        times.append(float(output.decode().strip().splitlines()[-1]))
+    times.sort()
+    return times[len(times) // 2]
+
+
+def breakdown(statement, count=8):
+    """(self us, cumulative us, module) of the slowest qqt modules imported by statement."""
+    process = subprocess.Popen([sys.executable, "-X", "importtime", "-c", "import Qt; " + statement],
+                               env=_env(), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, err = process.communicate()
+    rows = []
+    for line in err.decode().splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        selfTime, cumulative, module = line[len("import time:"):].split("|")
+        module = module.strip()
+        if module.startswith("qqt"):
+            rows.append((int(selfTime), int(cumulative), module))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--breakdown", action="store_true")
+    args = parser.parse_args(argv)
+
+    for statement in STATEMENTS:
+        sys.stdout.write("{0:<36} {1:>8.1f} ms\n".format(statement, measure(statement, args.repeat) * 1000))
+        if args.breakdown:
+            for selfTime, cumulative, module in breakdown(statement):
+                sys.stdout.write("    {0:<32} self {1:>7} us  cumulative {2:>7} us\n".format(module, selfTime, cumulative))
+
+
+if __name__ == '__main__':
+    main()
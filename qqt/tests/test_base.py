@@ -0,0 +1,97 @@
+import threading
+import unittest
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+from qqt import base
+from qqt.tests import application
+from qqt.base import ContextLocal, currentParent, popParent, pushParent
+from qqt.layouts import VBoxLayout
+
+
+class _Parent(object):
+    """stands in for a layout in threads, where no Qt layout is created."""
+
+    def __enter__(self):
+        pushParent(self)
+        return self
+
+    def __exit__(self, *args):
+        popParent()
+
+
+class ParentStackTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def test_nested_blocks(self):
+        self.assertIsNone(currentParent())
+        outer, inner = VBoxLayout(), VBoxLayout()
+        with outer:
+            self.assertIs(currentParent(), outer)
+            self.assertIs(base.glob_current_active_parent, outer)
+            with inner:
+                self.assertIs(currentParent(), inner)
+            self.assertIs(currentParent(), outer)
+        self.assertIsNone(currentParent())
+
+    @unittest.skipIf(asyncio is None or base.ContextVar is None, "needs asyncio and contextvars")
+    def test_interleaved_asyncio_tasks(self):
+        seen = {}
+
+        async def build(name, entered, other):
+            layout = VBoxLayout()
+            with layout:
+                entered.set()
+                # the other task enters its own block while this one is suspended in it.
+                await other.wait()
+                await asyncio.sleep(0)
+                seen[name] = currentParent() is layout
+            seen[name + " after"] = currentParent()
+
+        async def main():
+            first, second = asyncio.Event(), asyncio.Event()
+            await asyncio.gather(build("a", first, second), build("b", second, first))
+
+        asyncio.run(main())
+        self.assertEqual(seen, {"a": True, "b": True, "a after": None, "b after": None})
+        self.assertIsNone(currentParent())
+
+    def test_worker_thread(self):
+        seen = {}
+        inThread, mainEntered = threading.Event(), threading.Event()
+
+        def work():
+            with _Parent() as parent:
+                inThread.set()
+                mainEntered.wait(5)
+                seen["thread"] = currentParent() is parent
+
+        thread = threading.Thread(target=work)
+        layout = VBoxLayout()
+        thread.start()
+        inThread.wait(5)
+        with layout:
+            mainEntered.set()
+            thread.join(5)
+            self.assertIs(currentParent(), layout)
+        self.assertEqual(seen, {"thread": True})
+        self.assertIsNone(currentParent())
+
+
+class ContextLocalTest(unittest.TestCase):
+    def test_default_per_thread(self):
+        local = ContextLocal("qqtTestLocal", default=0)
+        local.set(1)
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(local.get()))
+        thread.start()
+        thread.join()
+        self.assertEqual((local.get(), seen), (1, [0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtGui
+from qqt.lib import readImage
+from qqt.resources.bundle import IconBundle, MAGIC, isBundle, packBundle
+from qqt.resources.icon import IconManager
+
+
+class BundleTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.tmp = tempfile.mkdtemp()
+        self.iconDir = os.path.join(self.tmp, "icons")
+        os.makedirs(os.path.join(self.iconDir, "sub"))
+        image = QtGui.QImage(40, 20, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(20, 120, 200))
+        image.save(os.path.join(self.iconDir, "wide.png"))
+        image.save(os.path.join(self.iconDir, "sub", "nested.png"))
+        with open(os.path.join(self.iconDir, "notes.txt"), "w") as f:
+            f.write("not an icon")
+        self.bundlePath = os.path.join(self.tmp, "icons.qqtb")
+
+    def tearDown(self):
+        for bundle in list(IconBundle.mounted.values()):
+            bundle.close()
+        shutil.rmtree(self.tmp)
+
+    def test_pack_and_read(self):
+        self.assertEqual(packBundle(self.iconDir, self.bundlePath), 2)
+        self.assertTrue(isBundle(self.bundlePath))
+        self.assertFalse(isBundle(os.path.join(self.iconDir, "wide.png")))
+        with open(self.bundlePath, "rb") as f:
+            self.assertEqual(f.read(len(MAGIC)), MAGIC)
+
+        bundle = IconBundle.mount(self.bundlePath)
+        self.assertIs(IconBundle.mount(self.bundlePath), bundle)
+        self.assertEqual(sorted(bundle.names()), ["sub/nested.png", "wide.png"])
+        with open(os.path.join(self.iconDir, "wide.png"), "rb") as f:
+            self.assertEqual(bundle.data("wide.png").tobytes(), f.read())
+        image = bundle.image("sub/nested.png")
+        self.assertEqual((image.width(), image.height()), (40, 20))
+
+        self.assertEqual(IconBundle.find(bundle.virtualPath("wide.png")), (bundle, "wide.png"))
+        self.assertIsNone(IconBundle.find(bundle.virtualPath("missing.png")))
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.tmp, "bad.qqtb")
+        with open(path, "wb") as f:
+            f.write(b"QQTX" + b"\0" * 16)
+        self.assertRaises(ValueError, IconBundle, path)
+
+    def test_icon_manager_reads_mounted_bundles(self):
+        packBundle(self.iconDir, self.bundlePath)
+        dirs = IconManager.dirs
+        self.addCleanup(IconManager.invalidateIndex)
+        self.addCleanup(setattr, IconManager, "dirs", dirs)
+        IconManager.dirs = []
+        IconManager.addDir(self.bundlePath)
+
+        path = IconManager.resolve("wide.png")
+        self.assertEqual(path, self.bundlePath + "/wide.png")
+        image = readImage(path, w=20)
+        self.assertEqual((image.width(), image.height()), (20, 10))
+        pix = IconManager.get("wide.png", type="pixmap")
+        self.assertEqual((pix.width(), pix.height()), (40, 20))
+
+
+if __name__ == '__main__':
+    unittest.main()
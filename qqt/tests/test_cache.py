@@ -0,0 +1,60 @@
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtGui
+from qqt.resources.cache import LRUCache, imageBytes
+
+
+class LRUCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = LRUCache(maxBytes=10, costFunc=len)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", "aaaa")
+        self.cache.put("b", "bbbb")
+        self.assertEqual(self.cache.get("a"), "aaaa")
+        self.cache.put("c", "cccc")
+        self.assertNotIn("b", self.cache)
+        self.assertIn("a", self.cache)
+        self.assertIn("c", self.cache)
+        self.assertEqual(self.cache.totalBytes, 8)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_byte_budget(self):
+        self.cache.put("a", "a" * 11)
+        self.assertEqual(len(self.cache), 0)
+        self.cache.put("a", "aaaaa")
+        self.cache.put("a", "aaa")
+        self.assertEqual(self.cache.totalBytes, 3)
+        self.cache.put("b", "bbbbbbb")
+        self.cache.setMaxBytes(5)
+        self.assertEqual(list(self.cache._entries), [])
+        self.assertEqual(self.cache.totalBytes, 0)
+
+    def test_cost_override(self):
+        self.cache.put("a", "aaaa", cost=0)
+        self.assertEqual(self.cache.totalBytes, 0)
+        self.cache.put("b", "bbbbbbbbbb")
+        self.assertEqual(self.cache.totalBytes, 10)
+
+    def test_stats(self):
+        self.cache.put("a", "a")
+        self.cache.get("a")
+        self.cache.get("b")
+        self.assertEqual(self.cache.lookup("a"), "a")
+        self.assertIsNone(self.cache.lookup("b"))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.cache.resetStats()
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_image_bytes(self):
+        application()
+        image = QtGui.QImage(10, 4, QtGui.QImage.Format_ARGB32)
+        self.assertEqual(imageBytes(image), 10 * 4 * 4)
+        self.assertEqual(imageBytes(QtGui.QImage()), 0)
+        self.assertEqual(imageBytes("text"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
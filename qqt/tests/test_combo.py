@@ -0,0 +1,246 @@
+import threading
+import time
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtCore, QtGui, QtWidgets
+from qqt.widgets.inputs import ComboBox, ComboBoxDefaults, ComboFilterModel, ComboModel
+
+Qt = QtCore.Qt
+
+
+def _icon():
+    pix = QtGui.QPixmap(16, 16)
+    pix.fill(QtGui.QColor(90, 140, 200))
+    return QtGui.QIcon(pix)
+
+
+class ComboModelTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.model = ComboModel()
+        self.model.setItems(["a", "b", "c"], [1, 2, 3])
+
+    def test_lookups(self):
+        self.assertEqual(self.model.rowForText("b"), 1)
+        self.assertEqual(self.model.rowForData(3), 2)
+        self.assertEqual(self.model.rowForText("x"), -1)
+        self.assertEqual(self.model.rowForData(None), -1)
+
+    def test_indexes_follow_insert_and_remove(self):
+        self.model.insertRows(0, 1)
+        self.model.setData(self.model.index(0, 0), "z", Qt.EditRole)
+        self.model.setData(self.model.index(0, 0), 0, Qt.UserRole)
+        self.assertEqual(self.model.rowForText("z"), 0)
+        self.assertEqual(self.model.rowForText("c"), 3)
+        self.assertEqual(self.model.rowForData(2), 2)
+
+        self.model.removeRows(1, 2)
+        self.assertEqual(self.model.texts(), ["z", "c"])
+        self.assertEqual(self.model.rowForText("a"), -1)
+        self.assertEqual(self.model.rowForData(3), 1)
+
+        self.model.appendItem("d", 4)
+        self.assertEqual(self.model.rowForData(4), 2)
+
+    def test_unhashable_data(self):
+        self.model.setItems(["a", "b"], [[1], {"x": 2}])
+        self.assertEqual(self.model.rowForData({"x": 2}), 1)
+
+    def test_other_roles_are_kept(self):
+        index = self.model.index(1, 0)
+        self.assertTrue(self.model.setData(index, "tip", Qt.ToolTipRole))
+        self.assertEqual(self.model.data(index, Qt.ToolTipRole), "tip")
+        self.assertIsNone(self.model.data(self.model.index(0, 0), Qt.ToolTipRole))
+        roles = self.model.itemData(index)
+        self.assertEqual(roles[Qt.DisplayRole], "b")
+        self.assertEqual(roles[Qt.UserRole], 2)
+        self.assertEqual(roles[Qt.ToolTipRole], "tip")
+
+        self.model.removeRows(0, 1)
+        self.assertEqual(self.model.data(self.model.index(0, 0), Qt.ToolTipRole), "tip")
+
+
+class ComboFilterModelTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.model = ComboModel()
+        self.model.setItems(["apple", "banana", "cherry"], [1, 2, 3])
+        self.filterModel = ComboFilterModel(self.model)
+
+    def texts(self):
+        return [self.filterModel.data(self.filterModel.index(row, 0)) for row in range(self.filterModel.rowCount())]
+
+    def test_query_narrows(self):
+        self.filterModel.setQuery("an")
+        self.assertEqual(self.texts(), ["banana"])
+        self.filterModel.setQuery("a")
+        self.assertEqual(self.texts(), ["apple", "banana"])
+
+    def test_follows_source_changes(self):
+        self.filterModel.setQuery("an")
+        self.model.appendItem("mango", 4)
+        self.assertEqual(self.texts(), ["banana", "mango"])
+        self.model.removeRows(1, 1)
+        self.assertEqual(self.texts(), ["mango"])
+        self.model.setItems(["orange", "kiwi"], [5, 6])
+        self.assertEqual(self.texts(), ["orange"])
+        self.assertEqual(self.filterModel.sourceRow(0), 0)
+
+
+class ComboPopupTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def test_single_click_chooses_once(self):
+        combo = ComboBox(searchable=True)
+        combo.setItems(["a", "b", "c"])
+        combo.show()
+        combo.showPopup()
+        popup = combo._popup
+        chosen = []
+        popup.rowChosen.connect(chosen.append)
+
+        index = popup.filterModel.index(2, 0)
+        popup.view.clicked.emit(index)
+        popup.view.activated.emit(index)
+        self.assertEqual(chosen, [2])
+        self.assertEqual(combo.currentIndex(), 2)
+        combo.close()
+
+
+class ComboProviderTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+
+    def wait(self, condition, timeout=5.0):
+        start = time.time()
+        while not condition() and time.time() - start < timeout:
+            self.app.processEvents()
+            time.sleep(0.005)
+        self.assertTrue(condition())
+
+    def test_provider_runs_on_first_popup(self):
+        calls = []
+
+        def provider():
+            calls.append(1)
+            return [("asset {0}".format(idx), idx) for idx in range(10)]
+
+        combo = ComboBox(provider=provider)
+        combo.setCurrentItem("asset 4", 4)
+        self.assertEqual(calls, [])
+        self.assertEqual(combo.getValue(), "asset 4")
+
+        combo.showPopup()
+        combo.hidePopup()
+        combo.showPopup()
+        combo.hidePopup()
+        self.assertEqual(calls, [1])
+        self.assertEqual(combo.count(), 10)
+        self.assertEqual(combo.getData(), 4)
+
+    def test_async_load_keeps_the_typed_filter(self):
+        release = threading.Event()
+
+        def provider():
+            release.wait(5)
+            return ["alpha", "beta", "gamma", "delta"]
+
+        combo = ComboBox(provider=provider, providerAsync=True, searchable=True)
+        combo.setCurrentItem("beta")
+        loaded = []
+        combo.itemsLoaded.connect(lambda: loaded.append(True))
+        combo.show()
+        combo.showPopup()
+        popup = combo._popup
+        popup.filterField.setText("ta")
+        popup.filterField.textEdited.emit("ta")
+
+        release.set()
+        self.wait(lambda: loaded)
+        self.assertTrue(popup.isVisible())
+        self.assertEqual(popup.filterField.text(), "ta")
+        rows = [popup.filterModel.data(popup.filterModel.index(row, 0))
+                for row in range(popup.filterModel.rowCount())]
+        self.assertEqual(rows, ["beta", "delta"])
+        self.assertEqual(popup.view.currentIndex().row(), 0)
+        combo.hidePopup()
+        combo.close()
+
+    def test_provider_errors_are_reported(self):
+        def provider():
+            raise RuntimeError("no database")
+
+        for asyncLoad in (False, True):
+            combo = ComboBox(provider=provider, providerAsync=asyncLoad)
+            errors = []
+            combo.providerFailed.connect(errors.append)
+            combo.loadItems()
+            self.wait(lambda: errors)
+            self.assertIsInstance(errors[0], RuntimeError)
+            self.assertEqual(combo.count(), 0)
+
+
+class ComboBoxTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def test_icons_are_kept(self):
+        combo = ComboBox()
+        combo.setItems(["a", "b"])
+        combo.setItemIcon(1, _icon())
+        combo.addItem(_icon(), "c", "dataC")
+        combo.insertItem(0, _icon(), "first")
+
+        self.assertFalse(combo.itemIcon(0).isNull())
+        self.assertTrue(combo.itemIcon(1).isNull())
+        self.assertFalse(combo.itemIcon(2).isNull())
+        self.assertFalse(combo.itemIcon(3).isNull())
+        self.assertEqual(combo.itemText(3), "c")
+        self.assertEqual(combo.itemData(3), "dataC")
+        self.assertEqual(combo.indexFromData("dataC"), 3)
+
+    def test_tooltips_are_kept(self):
+        combo = ComboBox()
+        combo.setItems(["a", "b"])
+        combo.setItemData(1, "tip", Qt.ToolTipRole)
+        self.assertEqual(combo.itemData(1, Qt.ToolTipRole), "tip")
+
+    def test_size_hint_matches_qcombobox(self):
+        items = ["item number {0}".format(idx) for idx in range(300)]
+        withIcon = QtWidgets.QComboBox.AdjustToMinimumContentsLengthWithIcon
+        for count in (5, 300):
+            for setup in (lambda combo: None,
+                          lambda combo: combo.setItemIcon(count - 1, _icon()),
+                          lambda combo: combo.setMinimumContentsLength(40),
+                          lambda combo: combo.setSizeAdjustPolicy(withIcon)):
+                combo = ComboBox()
+                combo.setItems(items[:count])
+                plain = QtWidgets.QComboBox()
+                plain.addItems(items[:count])
+                setup(combo)
+                setup(plain)
+                self.assertEqual(combo.sizeHint(), plain.sizeHint())
+                self.assertEqual(combo.minimumSizeHint(), plain.minimumSizeHint())
+
+    def test_large_item_count_default(self):
+        combo = ComboBox()
+        combo.addItems(["item {0}".format(idx) for idx in range(20)])
+        self.assertFalse(combo._usesContentsHint())
+        self.addCleanup(setattr, ComboBoxDefaults, "largeItemCount", ComboBoxDefaults.largeItemCount)
+        ComboBoxDefaults.largeItemCount = 10
+        self.assertTrue(combo._usesContentsHint())
+
+    def test_set_value(self):
+        combo = ComboBox()
+        combo.setItems(["a", "b", "c"], [10, 20, 30])
+        combo.setValue("c")
+        self.assertEqual(combo.getData(), 30)
+        combo.setValueFromData(20)
+        self.assertEqual(combo.getValue(), "b")
+        self.assertRaises(ValueError, combo.setValue, "x")
+
+
+if __name__ == '__main__':
+    unittest.main()
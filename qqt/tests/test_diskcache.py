@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtCore, QtGui
+from qqt.lib import readImage
+from qqt.resources.diskcache import DiskCache
+
+keep = QtCore.Qt.KeepAspectRatio
+fast = QtCore.Qt.FastTransformation
+
+
+class DiskCacheTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.tmp = tempfile.mkdtemp()
+        self.source = os.path.join(self.tmp, "source.png")
+        self._saveSource(QtGui.QColor(20, 120, 200))
+        self.cache = DiskCache(path=os.path.join(self.tmp, "cache"), maxBytes=1024 * 1024)
+
+    def tearDown(self):
+        DiskCache.disable()
+        shutil.rmtree(self.tmp)
+
+    def _saveSource(self, color, w=100, h=50):
+        image = QtGui.QImage(w, h, QtGui.QImage.Format_ARGB32)
+        image.fill(color)
+        image.save(self.source)
+
+    def test_key_follows_source_and_scaling(self):
+        key = self.cache.key(self.source, 20, None, keep, fast)
+        self.assertEqual(self.cache.key(self.source, 20, None, keep, fast), key)
+        self.assertNotEqual(self.cache.key(self.source, 30, None, keep, fast), key)
+        self.assertNotEqual(self.cache.key(self.source, 20, None, keep, QtCore.Qt.SmoothTransformation), key)
+        self.assertIsNone(self.cache.key(os.path.join(self.tmp, "missing.png"), 20, None, keep, fast))
+
+        self._saveSource(QtGui.QColor(20, 120, 200), w=120)
+        st = os.stat(self.source)
+        os.utime(self.source, (st.st_atime, st.st_mtime + 10))
+        self.assertNotEqual(self.cache.key(self.source, 20, None, keep, fast), key)
+
+    def test_store_and_load(self):
+        key = self.cache.key(self.source, 20, None, keep, fast)
+        self.assertIsNone(self.cache.load(key))
+        image = QtGui.QImage(20, 10, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(1, 2, 3))
+        self.cache.store(key, image)
+        loaded = self.cache.load(key)
+        self.assertEqual((loaded.width(), loaded.height()), (20, 10))
+        self.assertEqual(QtGui.QColor(loaded.pixel(0, 0)), QtGui.QColor(1, 2, 3))
+        self.assertEqual([name for name in os.listdir(self.cache.path) if name.endswith(".tmp")], [])
+
+    def test_trim_drops_least_recently_used(self):
+        image = QtGui.QImage(20, 10, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(1, 2, 3))
+        keys = ["a", "b", "c"]
+        for index, key in enumerate(keys):
+            self.cache.store(key, image)
+            entryPath = self.cache._entryPath(key)
+            os.utime(entryPath, (1000 + index, 1000 + index))
+        # loading refreshes the entry.
+        self.cache.load("a")
+        entrySize = os.path.getsize(self.cache._entryPath("a"))
+
+        self.cache.trim(entrySize * 2)
+        self.assertIsNone(self.cache.load("b"))
+        self.assertIsNotNone(self.cache.load("a"))
+        self.assertIsNotNone(self.cache.load("c"))
+        self.cache.clear()
+        self.assertEqual(self.cache.totalBytes(), 0)
+
+    def test_read_image_goes_through_the_shared_cache(self):
+        shared = DiskCache.enable(path=self.cache.path)
+        first = readImage(self.source, w=20)
+        self.assertEqual((first.width(), first.height()), (20, 10))
+        self.assertEqual(len(os.listdir(shared.path)), 1)
+
+        # the cached entry is used as long as the source is unchanged.
+        key = shared.key(self.source, 20, None, keep, fast)
+        marker = QtGui.QImage(20, 10, QtGui.QImage.Format_ARGB32)
+        marker.fill(QtGui.QColor(1, 2, 3))
+        shared.store(key, marker)
+        self.assertEqual(QtGui.QColor(readImage(self.source, w=20).pixel(0, 0)), QtGui.QColor(1, 2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
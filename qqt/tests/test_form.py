@@ -0,0 +1,60 @@
+import shutil
+import tempfile
+import unittest
+
+from qqt import spec
+from qqt.tests import application
+from qqt.base import QtWidgets, qcreate
+from qqt.widgets.displays import Form
+from qqt.widgets.inputs import StringField
+
+
+class FormTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def _labelTexts(self, form):
+        return [label.text() for label in form.findChildren(QtWidgets.QLabel)]
+
+    def test_adopts_left_labels(self):
+        for labelMode in ("widget", "painted"):
+            form = Form(labelMode="widget")
+            with form:
+                field = qcreate(StringField, label="name", labelMode=labelMode)
+            self.assertIsNone(field.labelContainer())
+            self.assertIs(field.parent(), form)
+            self.assertEqual(self._labelTexts(form), ["name"])
+            self.assertIs(form.grid.itemAtPosition(0, 1).widget(), field)
+
+    def test_keeps_other_label_positions(self):
+        form = Form(labelMode="widget")
+        with form:
+            field = qcreate(StringField, label="name", labelPosition="right")
+        container = field.labelContainer()
+        self.assertIsNotNone(container)
+        self.assertIs(form.grid.itemAtPosition(0, 0).widget(), container)
+        self.assertIs(form.grid.itemAtPosition(0, 1).widget(), container)
+
+    def test_direct_construction_keeps_label(self):
+        with Form():
+            field = StringField(label="name")
+        self.assertIsNotNone(field.labelContainer())
+        self.assertIs(field.labelWidget.parent(), field.labelContainer())
+
+    def test_spec_build_adopts_labels(self):
+        cacheDir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cacheDir)
+        self.addCleanup(setattr, spec, "cacheDir", spec.cacheDir)
+        spec.cacheDir = cacheDir
+
+        result = spec.build({"class": "qqt.widgets.displays.Form", "kwargs": {"labelMode": "widget"},
+                             "children": [{"class": "StringField", "name": "nameField",
+                                           "kwargs": {"label": "name"}}]})
+        form, field = result[None], result["nameField"]
+        self.assertIsNone(field.labelContainer())
+        self.assertEqual(self._labelTexts(form), ["name"])
+        self.assertIs(form.grid.itemAtPosition(0, 1).widget(), field)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import importlib
+import unittest
+
+from qqt.tests import application
+from qqt import gui
+
+# what qqt.gui star-imported before it loaded lazily; later modules win on name clashes.
+EAGER_MODULES = (".widgets.base", ".widgets.displays", ".widgets.inputs", ".widgets.listview", ".layouts", ".menu")
+
+
+class GuiExportsTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def eagerNamespace(self):
+        namespace = {}
+        for moduleName in EAGER_MODULES:
+            module = importlib.import_module(moduleName, "qqt")
+            namespace.update((name, value) for name, value in vars(module).items() if not name.startswith("_"))
+        return namespace
+
+    def test_lazy_surface_matches_eager_star_import(self):
+        eager = self.eagerNamespace()
+        self.assertEqual(sorted(gui.__all__), sorted(eager))
+        for name, value in eager.items():
+            self.assertIs(getattr(gui, name), value, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,272 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtCore, QtGui
+from qqt.lib import pixmap, readImage, scaledSize
+from qqt.resources.icon import IconManager
+from qqt.resources.loader import ImageLoader
+from qqt.widgets.inputs import Button, IconButton
+
+
+class ScaledSizeTest(unittest.TestCase):
+    def test_longer_side_drives_both_bounds(self):
+        self.assertEqual(scaledSize(100, 90, w=32, h=16), (32, 28))
+        self.assertEqual(scaledSize(90, 100, w=16, h=32), (28, 32))
+        self.assertEqual(scaledSize(100, 50, w=40, h=40), (40, 20))
+
+    def test_fit_inside_both_bounds(self):
+        self.assertEqual(scaledSize(100, 90, w=32, h=16, fit=True), (17, 16))
+        self.assertEqual(scaledSize(90, 100, w=16, h=32, fit=True), (16, 17))
+        self.assertEqual(scaledSize(100, 50, w=40, h=40, fit=True), (40, 20))
+
+    def test_single_bound(self):
+        self.assertEqual(scaledSize(100, 50, w=40), (40, 20))
+        self.assertEqual(scaledSize(100, 50, h=10), (20, 10))
+
+    def test_ignore_and_expand(self):
+        self.assertEqual(scaledSize(100, 90, w=32, h=16, aspectRatioMode=QtCore.Qt.IgnoreAspectRatio), (32, 16))
+        self.assertEqual(scaledSize(100, 90, w=32, h=16, aspectRatioMode=QtCore.Qt.KeepAspectRatioByExpanding,
+                                    fit=True), (32, 28))
+
+
+class IconManagerTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.tmp = tempfile.mkdtemp()
+        image = QtGui.QImage(100, 90, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(200, 80, 40))
+        image.save(os.path.join(self.tmp, "wide.png"))
+        self._dirs = IconManager.dirs
+        IconManager.dirs = [self.tmp]
+        IconManager.invalidateIndex()
+        IconManager.cache.resetStats()
+
+    def tearDown(self):
+        IconManager.dirs = self._dirs
+        IconManager.invalidateIndex()
+        shutil.rmtree(self.tmp)
+
+    def test_sized_pixmap_fits_inside(self):
+        pix = IconManager.get("wide.png", type="pixmap", size=(32, 16), dpr=1.0)
+        self.assertEqual((pix.width(), pix.height()), (17, 16))
+
+    def test_sized_icon_fits_inside(self):
+        icon = IconManager.get("wide.png", type="icon", size=(32, 16))
+        pix = icon.pixmap(32, 16)
+        self.assertLessEqual(pix.width(), 32)
+        self.assertLessEqual(pix.height(), 16)
+
+    def test_sized_icon_counts_once(self):
+        IconManager.clearCache()
+        IconManager.get("wide.png", type="icon", size=(32, 16))
+        variants = len(IconManager.devicePixelRatios())
+        stats = IconManager.cacheStats()
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 1))
+        self.assertEqual(stats["entries"], variants + 1)
+        # only the variant pixmaps are charged, 17x16 ARGB at a device pixel ratio of 1.
+        if variants == 1:
+            self.assertEqual(stats["bytes"], 17 * 16 * 4)
+
+        IconManager.get("wide.png", type="icon", size=(32, 16))
+        stats = IconManager.cacheStats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_sized_pixmap_is_the_variant(self):
+        IconManager.clearCache()
+        IconManager.get("wide.png", type="pixmap", size=(32, 16), dpr=1.0)
+        IconManager.get("wide.png", type="icon", size=(32, 16))
+        stats = IconManager.cacheStats()
+        self.assertEqual((stats["hits"], stats["misses"]), (0, 2))
+        self.assertEqual(stats["entries"], len(IconManager.devicePixelRatios()) + 1)
+
+    def test_lib_pixmap_keeps_its_rule(self):
+        path = os.path.join(self.tmp, "wide.png")
+        for pix in (pixmap(path, w=32, h=16), pixmap(QtGui.QPixmap(path), w=32, h=16)):
+            self.assertEqual((pix.width(), pix.height()), (32, 28))
+
+
+class ResolveTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.tmp = tempfile.mkdtemp()
+        self.first, self.second = os.path.join(self.tmp, "first"), os.path.join(self.tmp, "second")
+        os.makedirs(os.path.join(self.second, "sub"))
+        os.makedirs(self.first)
+        for path in (os.path.join(self.first, "a.png"), os.path.join(self.second, "a.png"),
+                     os.path.join(self.second, "sub", "b.png")):
+            open(path, "w").close()
+        self._dirs = IconManager.dirs
+        IconManager.dirs = [self.first, self.second]
+        IconManager.invalidateIndex()
+
+    def tearDown(self):
+        IconManager.dirs = self._dirs
+        IconManager.invalidateIndex()
+        shutil.rmtree(self.tmp)
+
+    def test_first_dir_wins(self):
+        self.assertEqual(IconManager.resolve("a.png"), os.path.join(self.first, "a.png"))
+
+    def test_nested_names(self):
+        self.assertEqual(IconManager.resolve("sub/b.png"), os.path.join(self.second, "sub", "b.png"))
+
+    def _cached(self, name):
+        IconManager.get(name, type="pixmap")
+        return (name, "pixmap", None) in IconManager.cache
+
+    def test_directory_change_keeps_unchanged_names(self):
+        self.assertTrue(self._cached("a.png"))
+        open(os.path.join(self.second, "c.png"), "w").close()
+        IconManager.invalidateIndex()
+        self.assertEqual(IconManager.resolve("c.png"), os.path.join(self.second, "c.png"))
+        self.assertIn(("a.png", "pixmap", None), IconManager.cache)
+
+    def test_directory_change_evicts_changed_names(self):
+        self.assertTrue(self._cached("a.png"))
+        self.assertTrue(self._cached("c.png"))
+        os.remove(os.path.join(self.first, "a.png"))
+        open(os.path.join(self.first, "c.png"), "w").close()
+        IconManager.invalidateIndex()
+        self.assertEqual(IconManager.resolve("a.png"), os.path.join(self.second, "a.png"))
+        self.assertNotIn(("a.png", "pixmap", None), IconManager.cache)
+        self.assertNotIn(("c.png", "pixmap", None), IconManager.cache)
+
+    def test_new_scale_file_evicts_its_base_name(self):
+        self.assertTrue(self._cached("a.png"))
+        open(os.path.join(self.first, "a@2x.png"), "w").close()
+        IconManager.invalidateIndex()
+        IconManager.resolve("a.png")
+        self.assertNotIn(("a.png", "pixmap", None), IconManager.cache)
+
+    def test_watches_only_current_dirs(self):
+        IconManager.resolve("a.png")
+        watched = IconManager._watcher.directories()
+        self.assertIn(self.first, watched)
+        self.assertIn(self.second, watched)
+        IconManager.dirs = [self.second]
+        IconManager.invalidateIndex()
+        IconManager.resolve("a.png")
+        watched = IconManager._watcher.directories()
+        self.assertNotIn(self.first, watched)
+        self.assertIn(self.second, watched)
+
+    def test_missing_names_are_remembered_until_invalidated(self):
+        self.assertEqual(IconManager.resolve("c.png"), "")
+        self.assertIn("c.png", IconManager._missing)
+        open(os.path.join(self.second, "c.png"), "w").close()
+        self.assertEqual(IconManager.resolve("c.png"), "")
+        IconManager.invalidateIndex()
+        self.assertEqual(IconManager.resolve("c.png"), os.path.join(self.second, "c.png"))
+
+
+class ReadImageTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def _save(self, name, w, h):
+        path = os.path.join(self.tmp, name)
+        image = QtGui.QImage(w, h, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(20, 120, 200))
+        self.assertTrue(image.save(path))
+        return path
+
+    def test_scales_formats_without_a_header_size(self):
+        if b"icns" not in [bytes(f.data()) for f in QtGui.QImageReader.supportedImageFormats()]:
+            self.skipTest("no icns image plugin")
+        path = self._save("icon.icns", 64, 64)
+        self.assertFalse(QtGui.QImageReader(path).size().isValid())
+        image = readImage(path, w=50)
+        self.assertEqual((image.width(), image.height()), (50, 50))
+
+    def _checkerboard(self, name):
+        path = os.path.join(self.tmp, name)
+        image = QtGui.QImage(120, 90, QtGui.QImage.Format_RGB32)
+        for x in range(120):
+            for y in range(90):
+                image.setPixel(x, y, 0xffffffff if (x // 3 + y // 3) % 2 else 0xff000000)
+        self.assertTrue(image.save(path))
+        return path
+
+    def test_transform_mode_is_honoured(self):
+        path = self._checkerboard("board.png")
+        full = QtGui.QImage(path)
+        for mode in (QtCore.Qt.FastTransformation, QtCore.Qt.SmoothTransformation):
+            expected = full.scaled(40, 30, QtCore.Qt.IgnoreAspectRatio, mode)
+            self.assertEqual(readImage(path, w=40, transformMode=mode), expected)
+
+    def test_jpeg_quality_follows_transform_mode(self):
+        path = self._checkerboard("board.jpg")
+        fast = readImage(path, w=40, transformMode=QtCore.Qt.FastTransformation)
+        smooth = readImage(path, w=40, transformMode=QtCore.Qt.SmoothTransformation)
+        self.assertEqual((fast.width(), fast.height()), (40, 30))
+        self.assertEqual((smooth.width(), smooth.height()), (40, 30))
+        self.assertNotEqual(fast, smooth)
+
+    def test_unsized_read_keeps_full_size(self):
+        image = readImage(self._save("wide.png", 100, 90))
+        self.assertEqual((image.width(), image.height()), (100, 90))
+
+
+class IconSetTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+        self.tmp = tempfile.mkdtemp()
+        image = QtGui.QImage(100, 90, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(200, 80, 40))
+        for name in ("wide.png", "other.png"):
+            image.save(os.path.join(self.tmp, name))
+        self._dirs, self._iconSetDir = IconManager.dirs, IconManager.iconSetDir
+        IconManager.dirs = [self.tmp]
+        IconManager.iconSetDir = self.tmp
+        IconManager.invalidateIndex()
+
+    def tearDown(self):
+        IconManager.dirs, IconManager.iconSetDir = self._dirs, self._iconSetDir
+        IconManager.invalidateIndex()
+        shutil.rmtree(self.tmp)
+
+    def _waitForPrefetch(self):
+        deadline = time.time() + 5
+        self.app.processEvents()
+        while time.time() < deadline and ImageLoader.pendingCount():
+            self.app.processEvents()
+        self.app.processEvents()
+
+    def test_records_owner_icon_size_and_async_icons(self):
+        with IconManager.recording("panel") as recorded:
+            button = Button("ok", icon="wide.png")
+            IconButton("other.png", asyncLoad=True, w=24, h=24)
+        iconSize = (button.iconSize().width(), button.iconSize().height())
+        expected = set([("wide.png", "icon", None, iconSize), ("other.png", "pixmap", (24, 24), None)])
+        self.assertEqual(recorded, expected)
+        self.assertEqual(set(IconManager.loadIconSet("panel")), expected)
+
+    def test_replay_decodes_unsized_icons_at_icon_size(self):
+        IconManager.saveIconSet("panel", [("wide.png", "icon", None, (16, 16))])
+        IconManager.clearCache()
+        self.assertEqual(IconManager.replay("panel"), 1)
+        self._waitForPrefetch()
+        self.assertIn(("wide.png", "variant", (16, 16), 1.0), IconManager.cache)
+
+        icon = IconManager.toIcon("wide.png", iconSize=QtCore.QSize(16, 16))
+        os.remove(os.path.join(self.tmp, "wide.png"))
+        # painted from the prefetched variant, the file is gone.
+        pix = icon.pixmap(16, 16)
+        self.assertEqual((pix.width(), pix.height()), (16, 14))
+
+    def test_loads_three_field_icon_sets(self):
+        with open(IconManager.iconSetPath("old"), "w") as f:
+            f.write('[["wide.png", "icon", [16, 16]]]')
+        self.assertEqual(IconManager.loadIconSet("old"), [("wide.png", "icon", (16, 16), None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
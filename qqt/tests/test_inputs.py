@@ -0,0 +1,178 @@
+import time
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtCore
+from qqt.widgets.inputs import IntSliderField, SliderFieldDefaults, StringField, StringFieldDefaults
+
+from Qt import QtTest
+
+
+class StringFieldTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+        self.field = StringField(changingDelay=20)
+        self.changing = []
+        self.field.valueChanging.connect(self.changing.append)
+
+    def type(self, text):
+        QtTest.QTest.keyClicks(self.field, text)
+
+    def settle(self, seconds=0.1):
+        start = time.time()
+        while time.time() - start < seconds:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_debounces_typing(self):
+        self.type("character_rig_v012")
+        self.assertEqual(self.changing, [])
+        self.settle()
+        self.assertEqual(self.changing, ["character_rig_v012"])
+
+    def test_max_wait(self):
+        self.field.setChangingDelay(1000, maxWait=30)
+        self.type("ab")
+        self.settle()
+        self.assertEqual(self.changing, ["ab"])
+
+    def test_same_text_is_not_repeated(self):
+        self.type("abc")
+        self.settle()
+        self.type("d")
+        QtTest.QTest.keyClick(self.field, QtCore.Qt.Key_Backspace)
+        self.settle()
+        self.assertEqual(self.changing, ["abc"])
+
+    def test_same_text_after_clear(self):
+        self.type("abc")
+        self.settle()
+        self.field.clear()
+        self.type("abc")
+        self.settle()
+        self.assertEqual(self.changing, ["abc", "abc"])
+
+    def test_same_text_after_set_text(self):
+        self.type("abc")
+        self.settle()
+        self.field.setText("xyz")
+        self.field.selectAll()
+        self.type("abc")
+        self.settle()
+        self.assertEqual(self.changing, ["abc", "abc"])
+
+    def test_set_text_drops_pending_value(self):
+        self.type("abc")
+        self.field.setText("xyz")
+        self.settle()
+        self.assertEqual(self.changing, [])
+
+    def test_changing_defaults(self):
+        self.addCleanup(setattr, StringFieldDefaults, "changingDelay", StringFieldDefaults.changingDelay)
+        self.addCleanup(setattr, StringFieldDefaults, "changingMaxWait", StringFieldDefaults.changingMaxWait)
+        StringFieldDefaults.changingDelay = 300
+        StringFieldDefaults.changingMaxWait = 1000
+        field = StringField()
+        self.assertEqual((field._changingDelay, field._changingMaxWait), (300, 1000))
+        StringFieldDefaults.changingDelay = 150
+        self.assertEqual(StringField()._changingDelay, 150)
+
+    def test_editing_finished_flushes(self):
+        edited = []
+        self.field.valueEdited.connect(edited.append)
+        self.field.setChangingDelay(10000)
+        self.type("abc")
+        self.field.editingFinished.emit()
+        self.assertEqual(self.changing, ["abc"])
+        self.assertEqual(edited, ["abc"])
+
+
+class SliderFieldTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+        self.field = IntSliderField()
+        self.events = []
+        self.field.valueEdited.connect(self.events.append)
+        self.field.dragStarted.connect(lambda: self.events.append("start"))
+        self.field.dragEnded.connect(lambda: self.events.append("end"))
+
+    def settle(self, seconds=0.1):
+        start = time.time()
+        while time.time() - start < seconds:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def press(self):
+        self.field.slider.setSliderDown(True)
+
+    def move(self, *values):
+        for value in values:
+            self.field.slider.setSliderPosition(value)
+
+    def release(self):
+        self.field.slider.setSliderDown(False)
+
+    def test_immediate(self):
+        self.press()
+        self.move(10, 20, 30)
+        self.release()
+        self.assertEqual(self.events, ["start", 0, 10, 20, 30, "end"])
+
+    def test_release(self):
+        self.field.setEmitPolicy(IntSliderField.EmitPolicy.Release)
+        self.press()
+        self.move(10, 20, 30)
+        self.settle()
+        self.assertEqual(self.events, ["start"])
+        self.release()
+        self.assertEqual(self.events, ["start", 30, "end"])
+
+    def test_trailing(self):
+        self.field.setEmitPolicy(IntSliderField.EmitPolicy.Trailing, delay=30)
+        self.press()
+        self.move(10, 20, 30)
+        self.assertEqual(self.events, ["start"])
+        self.settle()
+        self.assertEqual(self.events, ["start", 30])
+        self.move(40)
+        self.release()
+        self.assertEqual(self.events, ["start", 30, 40, "end"])
+
+    def test_trailing_value_is_not_repeated(self):
+        self.field.setEmitPolicy(IntSliderField.EmitPolicy.Trailing, delay=30)
+        self.press()
+        self.move(10)
+        self.settle()
+        self.release()
+        self.assertEqual(self.events, ["start", 10, "end"])
+
+    def test_rate_limited(self):
+        self.field.setEmitPolicy(IntSliderField.EmitPolicy.RateLimited, rate=10)
+        self.press()
+        self.move(10, 20, 30)
+        # the press is the leading edge, the moves wait for the interval.
+        self.assertEqual(self.events, ["start", 0])
+        self.settle(0.15)
+        self.assertEqual(self.events, ["start", 0, 30])
+        # still inside the interval the timeout started: only the last move is sent, on release.
+        self.move(40, 50)
+        self.release()
+        self.assertEqual(self.events, ["start", 0, 30, 50, "end"])
+
+    def test_policy_defaults(self):
+        self.addCleanup(setattr, SliderFieldDefaults, "emitPolicy", SliderFieldDefaults.emitPolicy)
+        SliderFieldDefaults.emitPolicy = IntSliderField.EmitPolicy.Release
+        self.assertEqual(IntSliderField().getEmitPolicy(), IntSliderField.EmitPolicy.Release)
+
+    def test_edits_outside_a_drag_emit_immediately(self):
+        for policy in (IntSliderField.EmitPolicy.RateLimited, IntSliderField.EmitPolicy.Trailing,
+                       IntSliderField.EmitPolicy.Release):
+            del self.events[:]
+            self.field.setEmitPolicy(policy)
+            self.field.maxBtn.click()
+            self.field.updateField(40)
+            self.assertEqual(self.events, [100, 40])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtGui, QtWidgets
+from qqt.widgets.inputs import StringField
+
+
+class PaintedLabelTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def _textPixels(self, widget, rect):
+        image = widget.grab().toImage()
+        text = widget.palette().color(QtGui.QPalette.WindowText)
+        count = 0
+        for x in range(rect.left(), rect.right() + 1):
+            for y in range(rect.top(), rect.bottom() + 1):
+                color = QtGui.QColor(image.pixel(x, y))
+                if abs(color.red() - text.red()) + abs(color.green() - text.green()) < 100:
+                    count += 1
+        return count
+
+    def test_label_is_painted_over_a_group_box(self):
+        box = QtWidgets.QGroupBox("options")
+        box.setStyleSheet("QGroupBox { background: rgb(255, 0, 0); }")
+        layout = QtWidgets.QVBoxLayout(box)
+        field = StringField(label="name", labelMode="painted")
+        layout.addLayout(field.labelContainer())
+        box.resize(200, 80)
+        box.show()
+        application().processEvents()
+        self.assertGreater(self._textPixels(box, field._labelSpacer.geometry()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
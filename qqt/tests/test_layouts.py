@@ -0,0 +1,102 @@
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtCore, QtWidgets, qcreate
+from qqt.layouts import LayoutMixin, VBoxLayout
+from qqt.widgets.inputs import StringField
+
+
+class _LayoutRequestCounter(QtCore.QObject):
+    def __init__(self):
+        super(_LayoutRequestCounter, self).__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.LayoutRequest:
+            self.count += 1
+        return False
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+        self.app.processEvents()
+        LayoutMixin.resetBatchStats()
+        self.counter = _LayoutRequestCounter()
+        self.app.installEventFilter(self.counter)
+        self.addCleanup(self.app.removeEventFilter, self.counter)
+
+    def _buildFields(self, batched, owned=True, count=5):
+        host = QtWidgets.QWidget()
+        with VBoxLayout(host):
+            layout = qcreate(VBoxLayout) if owned else VBoxLayout()
+            with layout.batched(batched):
+                for idx in range(count):
+                    qcreate(StringField, label="field {0}".format(idx))
+            if not owned:
+                host.layout().addLayout(layout)
+        host.show()
+        self.app.processEvents()
+        return host
+
+    def test_owned_layout_drops_layout_requests(self):
+        self._buildFields(False)
+        unbatched = self.counter.count
+        self.counter.count = 0
+
+        host = self._buildFields(True)
+        self.assertLess(self.counter.count, unbatched)
+        self.assertEqual(self.counter.count + LayoutMixin.batchStats["avoided"], unbatched)
+        self.assertEqual(LayoutMixin.batchStats["attached"], 5)
+        # the layouts were activated when the host was shown.
+        field = host.findChildren(StringField)[-1]
+        self.assertGreater(field.width(), 0)
+
+    def test_unowned_layout_drops_its_fields_requests(self):
+        self._buildFields(False, owned=False)
+        unbatched = self.counter.count
+        self.counter.count = 0
+
+        self._buildFields(True, owned=False)
+        self.assertLess(self.counter.count, unbatched)
+        self.assertEqual(self.counter.count + LayoutMixin.batchStats["avoided"], unbatched)
+
+    def test_suspends_owner_and_attached_layouts(self):
+        host = QtWidgets.QWidget()
+        layout = VBoxLayout(host)
+        with layout.batched():
+            field = qcreate(StringField, label="name")
+            self.assertFalse(layout.isEnabled())
+            self.assertFalse(host.updatesEnabled())
+            self.assertFalse(field.labelContainer().layout().isEnabled())
+        self.assertTrue(layout.isEnabled())
+        self.assertTrue(host.updatesEnabled())
+        self.assertTrue(field.labelContainer().layout().isEnabled())
+
+    def test_visible_layouts_are_activated_once(self):
+        host = QtWidgets.QWidget()
+        layout = VBoxLayout(host)
+        host.resize(300, 200)
+        host.show()
+        self.app.processEvents()
+        self.counter.count = 0
+        with layout.batched():
+            button = qcreate(QtWidgets.QPushButton, "ok")
+        self.assertEqual(button.geometry(), layout.itemAt(0).geometry())
+        self.assertTrue(button.geometry().isValid())
+        self.app.processEvents()
+        self.assertEqual(self.counter.count, 0)
+
+    def test_nested_blocks_join_the_outer_batch(self):
+        host = QtWidgets.QWidget()
+        layout = VBoxLayout(host)
+        with layout.batched():
+            with qcreate(VBoxLayout):
+                qcreate(QtWidgets.QPushButton)
+                qcreate(QtWidgets.QPushButton)
+        self.assertEqual(LayoutMixin.batchStats["blocks"], 1)
+        self.assertEqual(LayoutMixin.batchStats["attached"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtWidgets, qcreate
+from qqt.layouts import VBoxLayout
+from qqt.widgets.base import LazyWidget
+from qqt.widgets.displays import TabLayout, TabWidget
+from qqt.widgets.inputs import StringField
+
+
+class LazyWidgetTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def test_builds_on_show(self):
+        host = QtWidgets.QWidget()
+        with VBoxLayout(host):
+            lazy = qcreate(StringField, lazy=True)
+        self.assertIsInstance(lazy, LazyWidget)
+        self.assertFalse(lazy.isMaterialized())
+        self.assertEqual(host.findChildren(StringField), [])
+
+        built = []
+        lazy.materialized.connect(built.append)
+        host.show()
+        self.assertTrue(lazy.isMaterialized())
+        self.assertIsInstance(built[0], StringField)
+        self.assertEqual(host.findChildren(StringField), built)
+        host.close()
+
+    def test_widget_and_attributes_build(self):
+        lazy = qcreate(StringField, lazy=True)
+        self.assertIsInstance(lazy.widget, StringField)
+        self.assertIs(lazy.widget, lazy.widget)
+
+        lazy = qcreate(StringField, lazy=True)
+        lazy.setText("deferred")
+        self.assertTrue(lazy.isMaterialized())
+        self.assertEqual(lazy.widget.text(), "deferred")
+
+    def test_private_names_do_not_build(self):
+        lazy = qcreate(StringField, lazy=True)
+        self.assertRaises(AttributeError, getattr, lazy, "_missing")
+        self.assertFalse(lazy.isMaterialized())
+
+    def test_builder_fills_content(self):
+        calls = []
+
+        def builder(widget):
+            calls.append(widget)
+            with widget.layout():
+                qcreate(StringField)
+
+        lazy = qcreate(QtWidgets.QWidget, layoutType=VBoxLayout, lazy=True, builder=builder)
+        self.assertEqual(calls, [])
+        widget = lazy.widget
+        self.assertEqual(calls, [widget])
+        self.assertEqual(len(widget.findChildren(StringField)), 1)
+
+    def test_ignored_for_layouts(self):
+        layout = qcreate(VBoxLayout, lazy=True)
+        self.assertIsInstance(layout, VBoxLayout)
+
+    def test_tab_titles(self):
+        tabs = TabLayout()
+        with tabs:
+            qcreate(TabWidget, title="first", lazy=True)
+            qcreate(TabWidget, "second", lazy=True)
+            qcreate(TabWidget, "third")
+        self.assertEqual([tabs.tabText(i) for i in range(tabs.count())], ["first", "second", "third"])
+
+
+if __name__ == '__main__':
+    unittest.main()
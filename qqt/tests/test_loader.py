@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtCore, QtGui, QtCompat
+from qqt.resources.loader import ImageLoader, _DecodeTask, _Relay
+
+
+class _Blocker(QtCore.QRunnable):
+    """occupies a pool thread until released, so requests queued behind it don't start."""
+
+    def __init__(self):
+        super(_Blocker, self).__init__()
+        self.event = threading.Event()
+
+    def run(self):
+        self.event.wait(5)
+
+
+class ImageLoaderTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "wide.png")
+        image = QtGui.QImage(100, 90, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(200, 80, 40))
+        image.save(self.path)
+
+        pool = QtCore.QThreadPool.globalInstance()
+        self.addCleanup(pool.setMaxThreadCount, pool.maxThreadCount())
+        pool.setMaxThreadCount(1)
+        self.blocker = _Blocker()
+        self.blocker.setAutoDelete(False)
+        pool.start(self.blocker)
+        self.addCleanup(self.blocker.event.set)
+
+    def tearDown(self):
+        self.blocker.event.set()
+        self.wait()
+        shutil.rmtree(self.tmp)
+
+    def wait(self, timeout=5):
+        deadline = time.time() + timeout
+        while time.time() < deadline and ImageLoader.pendingCount():
+            self.app.processEvents()
+            time.sleep(0.005)
+        QtCore.QThreadPool.globalInstance().waitForDone()
+        self.app.processEvents()
+
+    def test_identical_requests_share_one_decode(self):
+        first, second, other = [], [], []
+        ImageLoader.request(self.path, first.append, w=20)
+        ImageLoader.request(self.path, second.append, w=20)
+        ImageLoader.request(self.path, other.append, w=30)
+        self.assertEqual(ImageLoader.pendingCount(), 2)
+
+        self.blocker.event.set()
+        self.wait()
+        self.assertEqual([(pix.width(), pix.height()) for pix in first + second], [(20, 18), (20, 18)])
+        self.assertEqual([(pix.width(), pix.height()) for pix in other], [(30, 27)])
+        self.assertEqual(ImageLoader.pendingCount(), 0)
+
+    def test_destroyed_target_cancels_the_decode(self):
+        loaded = []
+        target = QtCore.QObject()
+        ImageLoader.request(self.path, loaded.append, w=20, target=target)
+        task = ImageLoader._tasks[(self.path, 20, None, QtCore.Qt.KeepAspectRatio,
+                                   QtCore.Qt.FastTransformation, False)]
+        QtCompat.delete(target)
+        self.assertTrue(task.cancelled)
+        self.assertEqual(ImageLoader.pendingCount(), 0)
+
+        self.blocker.event.set()
+        self.wait()
+        self.assertEqual(loaded, [])
+
+    def test_other_callers_keep_the_decode(self):
+        loaded, kept = [], []
+        target = QtCore.QObject()
+        ImageLoader.request(self.path, loaded.append, w=20, target=target)
+        ImageLoader.request(self.path, kept.append, w=20)
+        QtCompat.delete(target)
+        self.assertEqual(ImageLoader.pendingCount(), 1)
+
+        self.blocker.event.set()
+        self.wait()
+        self.assertEqual(loaded, [])
+        self.assertEqual(len(kept), 1)
+
+    def test_cancel_all(self):
+        loaded = []
+        ImageLoader.request(self.path, loaded.append, w=20)
+        task = list(ImageLoader._tasks.values())[0]
+        ImageLoader.cancelAll()
+        self.assertTrue(task.cancelled)
+        self.assertEqual(ImageLoader.pendingCount(), 0)
+
+        self.blocker.event.set()
+        self.wait()
+        self.assertEqual(loaded, [])
+
+    def test_deleted_relay_is_ignored(self):
+        relay = _Relay()
+        task = _DecodeTask((self.path, 20, None, QtCore.Qt.KeepAspectRatio, QtCore.Qt.FastTransformation, False),
+                           relay)
+        QtCompat.delete(relay)
+        task.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
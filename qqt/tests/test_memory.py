@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from qqt.tests import application
+from qqt.base import QtGui, QtWidgets
+from qqt.resources.memory import ImageMemory
+from qqt.widgets.displays import Image
+
+
+class ImageMemoryTest(unittest.TestCase):
+    def setUp(self):
+        self.app = application()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "big.png")
+        image = QtGui.QImage(400, 300, QtGui.QImage.Format_ARGB32)
+        image.fill(QtGui.QColor(20, 120, 200))
+        image.save(self.path)
+        self._budget = ImageMemory.budget
+
+    def tearDown(self):
+        ImageMemory.setBudget(self._budget)
+        shutil.rmtree(self.tmp)
+
+    def test_never_shown_image_is_not_downgraded(self):
+        ImageMemory.setBudget(1)
+        image = Image(self.path)
+        self.assertEqual(image.pixmap().width(), 400)
+
+    def test_hidden_image_is_downgraded_and_restored(self):
+        host = QtWidgets.QWidget()
+        image = Image(self.path, parent=host)
+        host.show()
+        self.app.processEvents()
+        host.hide()
+
+        ImageMemory.setBudget(1)
+        self.assertLessEqual(image.pixmap().width(), ImageMemory.thumbnailSize)
+
+        ImageMemory.setBudget(None)
+        host.show()
+        self.assertEqual(image.pixmap().width(), 400)
+        host.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import sys
+import unittest
+
+from qqt import profiler
+from qqt.tests import application
+from qqt.base import QtWidgets, qcreate
+from qqt.layouts import VBoxLayout
+from qqt.widgets.inputs import StringField
+
+
+class Panel(QtWidgets.QWidget):
+    def __init__(self):
+        super(Panel, self).__init__()
+        with VBoxLayout(self):
+            qcreate(StringField, label="name")
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        application()
+
+    def _records(self, prof):
+        return dict((record.className, record) for record in prof.records)
+
+    def test_nothing_is_recorded_when_disabled(self):
+        prof = profiler.Profiler()
+        with profiler.profiling(prof):
+            pass
+        qcreate(StringField)
+        self.assertFalse(profiler.isEnabled())
+        self.assertEqual(prof.records, [])
+
+    def test_nested_self_time(self):
+        with profiler.profiling() as prof:
+            qcreate(Panel)
+        records = self._records(prof)
+        panel, field = records["Panel"], records["StringField"]
+        self.assertAlmostEqual(panel.childTime, field.duration)
+        self.assertAlmostEqual(panel.selfTime, panel.duration - field.duration)
+        self.assertEqual(field.childTime, 0.0)
+
+    def test_sections_go_to_their_record(self):
+        with profiler.profiling() as prof:
+            qcreate(Panel)
+        records = self._records(prof)
+        panel, field = records["Panel"], records["StringField"]
+        self.assertEqual([section[0] for section in field.sections], ["initLayout", "attach"])
+        self.assertEqual(panel.sections, [])
+        self.assertLessEqual(field.sectionTime("initLayout") + field.sectionTime("attach"), field.duration)
+
+    def test_call_sites(self):
+        with profiler.profiling() as prof:
+            line = sys._getframe().f_lineno + 1
+            qcreate(StringField)
+            lazyLine = sys._getframe().f_lineno + 1
+            qcreate(StringField, lazy=True)
+        sites = [(record.className, record.site) for record in prof.records]
+        here = __file__.rstrip("c")
+        self.assertEqual(sites[0], ("StringField", "{0}:{1} (test_call_sites)".format(here, line)))
+        # the placeholder is recorded at the caller's line too, nested in the lazy call's record.
+        lazySite = "{0}:{1} (test_call_sites)".format(here, lazyLine)
+        self.assertEqual(sites[1:], [("LazyWidget", lazySite), ("StringField", lazySite)])
+
+    def test_summary_and_report(self):
+        with profiler.profiling() as prof:
+            qcreate(Panel)
+            qcreate(Panel)
+        rows = dict((row["key"], row) for row in prof.summary())
+        self.assertEqual(sorted(rows), ["Panel", "StringField"])
+        self.assertEqual(rows["StringField"]["count"], 2)
+        field = [record for record in prof.records if record.className == "StringField"]
+        self.assertAlmostEqual(rows["StringField"]["total"], sum(record.duration for record in field))
+        self.assertAlmostEqual(rows["StringField"]["initLayout"],
+                               sum(record.sectionTime("initLayout") for record in field))
+        self.assertEqual(rows["Panel"]["attach"], 0.0)
+        self.assertEqual([row["key"] for row in prof.summary()],
+                         sorted(rows, key=lambda key: rows[key]["total"], reverse=True))
+
+        # both fields come from Panel.__init__, the panels from two lines here.
+        siteCounts = sorted((row["key"].endswith("(__init__)"), row["count"]) for row in prof.summary(by="site"))
+        self.assertEqual(siteCounts, [(False, 1), (False, 1), (True, 2)])
+
+        lines = prof.report().splitlines()
+        self.assertEqual(lines[0].split(), ["count", "total", "ms", "self", "ms", "initLayout", "attach", "ms",
+                                            "class"])
+        self.assertEqual(sorted(line.split()[-1] for line in lines[1:]), ["Panel", "StringField"])
+        self.assertEqual(len(prof.report(sortKey="self", limit=1).splitlines()), 2)
+
+    def test_chrome_trace(self):
+        with profiler.profiling() as prof:
+            qcreate(Panel)
+        trace = json.loads(json.dumps(prof.chromeTrace()))
+        events = trace["traceEvents"]
+        self.assertEqual(sorted(event["name"] for event in events),
+                         ["Panel", "StringField", "attach", "initLayout"])
+        self.assertEqual([event["ts"] for event in events], sorted(event["ts"] for event in events))
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+        sections = [event for event in events if event["name"] in ("attach", "initLayout")]
+        self.assertEqual([event["args"]["widget"] for event in sections], ["StringField", "StringField"])
+
+
+if __name__ == '__main__':
+    unittest.main()
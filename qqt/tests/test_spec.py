@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from qqt import spec
+from qqt.tests import application
+from qqt.base import QtWidgets
+from qqt.widgets.inputs import StringField
+
+testSpec = {"class": "VBoxLayout", "children": [
+    {"class": "StringField", "name": "nameField", "kwargs": {"label": "name"}},
+    {"class": "HBoxLayout", "children": [
+        {"class": "QPushButton", "name": "okBtn", "args": ["ok"]},
+        {"class": "QPushButton", "name": "cancelBtn", "args": ["cancel"]}]}]}
+
+
+class SpecTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.tmp = tempfile.mkdtemp()
+        self._cacheDir = spec.cacheDir
+        spec.cacheDir = self.tmp
+        spec._compiled.clear()
+
+    def tearDown(self):
+        spec.cacheDir = self._cacheDir
+        spec._compiled.clear()
+        shutil.rmtree(self.tmp)
+
+    def _build(self):
+        class Owner(object):
+            pass
+
+        host = QtWidgets.QWidget()
+        owner = Owner()
+        result = spec.build(testSpec, parent=host, owner=owner)
+        return host, owner, result
+
+    def test_builds_the_tree(self):
+        host, owner, result = self._build()
+        self.assertIs(host.layout(), result[None])
+        self.assertIsInstance(owner.nameField, StringField)
+        self.assertEqual(owner.okBtn.text(), "ok")
+        self.assertEqual(owner.nameField.labelWidget.text(), "name")
+        self.assertIs(owner.okBtn.window(), host)
+        self.assertIs(owner.nameField.window(), host)
+
+    def test_hash_ignores_key_order(self):
+        reordered = {"children": testSpec["children"], "class": "VBoxLayout"}
+        self.assertEqual(spec.specHash(reordered), spec.specHash(testSpec))
+        self.assertNotEqual(spec.specHash({"class": "HBoxLayout"}), spec.specHash(testSpec))
+
+    def test_routine_is_compiled_once(self):
+        self._build()
+        key = spec.specHash(testSpec)
+        self.assertIn(key, spec._compiled)
+        self.assertTrue(os.path.isfile(spec._cachePath(key)))
+
+        # later builds, in this process or the next one, don't compile again.
+        compileSpec = spec.compileSpec
+        self.addCleanup(setattr, spec, "compileSpec", compileSpec)
+        spec.compileSpec = None
+        self._build()
+        spec._compiled.clear()
+        host, owner, result = self._build()
+        self.assertEqual(owner.cancelBtn.text(), "cancel")
+
+    def test_broken_cache_files_are_recompiled(self):
+        path = spec._cachePath(spec.specHash(testSpec))
+        with open(path, "wb") as f:
+            f.write(b"not marshal data")
+        host, owner, result = self._build()
+        self.assertEqual(owner.okBtn.text(), "ok")
+
+    def test_cache_files_are_per_compiler_version(self):
+        key = spec.specHash(testSpec)
+        self.assertIn(".v{0}.".format(spec.COMPILER_VERSION), os.path.basename(spec._cachePath(key)))
+
+
+if __name__ == '__main__':
+    unittest.main()
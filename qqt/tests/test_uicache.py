@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from qqt.tests import application
+from qqt import uicache
+
+UI = """<?xml version="1.0" encoding="UTF-8"?>
+<ui version="4.0">
+ <class>Form</class>
+ <widget class="QWidget" name="Form">
+  <layout class="QVBoxLayout" name="layout">
+   <item><widget class="QPushButton" name="button"/></item>
+  </layout>
+ </widget>
+</ui>
+"""
+
+
+class UiCacheTest(unittest.TestCase):
+    def setUp(self):
+        application()
+        self.tmp = tempfile.mkdtemp()
+        self.uifile = os.path.join(self.tmp, "form.ui")
+        with open(self.uifile, "w") as f:
+            f.write(UI)
+        self._cacheDir, self._compile = uicache.cacheDir, uicache._compileWithUic
+        uicache.cacheDir = os.path.join(self.tmp, "cache")
+
+    def tearDown(self):
+        uicache.cacheDir, uicache._compileWithUic = self._cacheDir, self._compile
+        uicache._modules.clear()
+        shutil.rmtree(self.tmp)
+
+    def test_failed_compile_is_not_retried(self):
+        calls = []
+
+        def failingCompile(uifile):
+            calls.append(uifile)
+            return None
+        uicache._compileWithUic = failingCompile
+
+        for _ in range(3):
+            widget = uicache.loadUi(self.uifile)
+            self.assertTrue(hasattr(widget, "button"))
+        self.assertEqual(len(calls), 1)
+
+    def test_import_error_falls_back(self):
+        uicache._compileWithUic = lambda uifile: (
+            "import qqt_missing_resources_rc\n"
+            "class Ui_Form(object):\n"
+            "    def setupUi(self, form):\n"
+            "        pass\n")
+
+        widget = uicache.loadUi(self.uifile)
+        self.assertTrue(hasattr(widget, "button"))
+        self.assertIsNone(uicache.compiledModule(self.uifile))
+
+
+if __name__ == '__main__':
+    unittest.main()
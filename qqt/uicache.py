@@ -0,0 +1,142 @@
+"""compile-and-cache replacement for QtCompat.loadUi.
+
+.ui files are compiled to python with the binding's own uic, stored in a user cache keyed by the
+file's content hash and the binding, and imported on later calls. editing the .ui changes the hash,
+so the module is rebuilt automatically. without a usable uic, loadUi falls back to QtCompat.loadUi.
+"""
+import hashlib
+import io
+import os
+import subprocess
+import sys
+from xml.etree import ElementTree
+
+import Qt
+
+from .base import QtWidgets, QtCompat
+
+cacheDir = os.path.join(os.path.expanduser("~"), ".cache", "qqt", "ui")
+# cache key: compiled module, or _failed when it can't be compiled or imported here.
+_modules = {}
+_keys = {}
+_failed = object()
+
+
+def _compileWithUic(uifile):
+    binding = Qt.__binding__
+    compiler = None
+    if binding.startswith("PyQt"):
+        compiler = __import__(binding + ".uic", fromlist=["uic"])
+    elif binding == "PySide2":
+        try:
+            import pyside2uic as compiler
+        except ImportError:
+            pass
+
+    if compiler is not None:
+        stream = io.StringIO() if sys.version_info[0] >= 3 else io.BytesIO()
+        try:
+            compiler.compileUi(uifile, stream)
+            return stream.getvalue()
+        except Exception:
+            # try the command line tool below, or leave the file to the dynamic loader.
+            pass
+
+    tool = {"PySide2": "pyside2-uic", "PySide6": "pyside6-uic"}.get(binding)
+    if tool is None:
+        return None
+    try:
+        with open(os.devnull, "w") as devnull:
+            output = subprocess.check_output([tool, uifile], stderr=devnull)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode("utf-8")
+
+
+def cacheKey(uifile):
+    """content hash of uifile plus binding, memoized on the file's mtime and size."""
+    st = os.stat(uifile)
+    stamp = (st.st_mtime, st.st_size)
+    memo = _keys.get(uifile)
+    if memo and memo[0] == stamp:
+        return memo[1]
+
+    with open(uifile, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    key = "ui_{0}_{1}_{2}".format(digest, Qt.__binding__, Qt.__binding_version__.replace(".", "_"))
+    _keys[uifile] = (stamp, key)
+    return key
+
+
+def _loadModule(name, path):
+    if sys.version_info[0] >= 3:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    import imp
+    return imp.load_source(name, path)
+
+
+def compiledModule(uifile):
+    """return the compiled python module of uifile, building it if needed.
+
+    None if uic is unavailable or the module fails to import; that is remembered per cache key.
+    """
+    uifile = os.path.abspath(str(uifile))
+    key = cacheKey(uifile)
+    module = _modules.get(key)
+    if module is not None:
+        return None if module is _failed else module
+
+    modulePath = os.path.join(cacheDir, key + ".py")
+    if not os.path.isfile(modulePath):
+        source = _compileWithUic(uifile)
+        if source is None:
+            _modules[key] = _failed
+            return None
+        # remember the top-level class so loadUi never has to parse the xml again.
+        topClass = ElementTree.parse(uifile).getroot().find("widget").get("class")
+        source = "{0}\n__qqtTopClass__ = {1!r}\n".format(source, str(topClass))
+        if not os.path.isdir(cacheDir):
+            os.makedirs(cacheDir)
+        tmpPath = "{0}.{1}.tmp".format(modulePath, os.getpid())
+        with io.open(tmpPath, "w", encoding="utf-8") as f:
+            f.write(source if isinstance(source, type(u"")) else source.decode("utf-8"))
+        getattr(os, "replace", os.rename)(tmpPath, modulePath)
+
+    try:
+        module = _loadModule(key, modulePath)
+    except Exception:
+        # e.g. an `import res_rc` of a resource module that isn't importable from here.
+        module = _failed
+    _modules[key] = module
+    return None if module is _failed else module
+
+
+def loadUi(uifile, baseinstance=None):
+    """drop-in QtCompat.loadUi that builds from a cached, compiled module.
+
+    widgets are set as attributes on baseinstance, which is created from the .ui's top-level
+    class when not given.
+    """
+    try:
+        module = compiledModule(uifile)
+    except (IOError, OSError, SyntaxError, ElementTree.ParseError):
+        module = None
+    formClasses = [value for name, value in vars(module).items() if name.startswith("Ui_")] if module else []
+    if not formClasses:
+        return QtCompat.loadUi(uifile, baseinstance)
+
+    if baseinstance is None:
+        widgetClass = getattr(QtWidgets, getattr(module, "__qqtTopClass__", ""), None)
+        if widgetClass is None:
+            return QtCompat.loadUi(uifile, baseinstance)
+        baseinstance = widgetClass()
+
+    form = formClasses[0]()
+    form.setupUi(baseinstance)
+    for name, value in vars(form).items():
+        setattr(baseinstance, name, value)
+    return baseinstance
@@ -1,4 +1,11 @@
-from ..base import QtGui, QtWidgets
+try:
+    from inspect import getfullargspec as _getargspec
+except ImportError:
+    from inspect import getargspec as _getargspec
+
+from .. import base
+from ..base import QtCore, QtGui, QtWidgets
+from ..lib import fontMetrics, textWidth
 from ..layouts import HBoxLayout, VBoxLayout
 
 
@@ -21,18 +28,259 @@ class GenericWidget(QtWidgets.QWidget):
         return ui
 
 
+def _initArgument(uiClass, name, args, kwargs, default=None):
+    """value of the __init__ argument name when calling uiClass(*args, **kwargs)."""
+    if name in kwargs:
+        return kwargs[name]
+    try:
+        argNames = _getargspec(uiClass.__init__).args[1:]
+    except TypeError:
+        # Qt's own __init__ can't be inspected.
+        return default
+    if name in argNames and argNames.index(name) < len(args):
+        return args[argNames.index(name)]
+    return default
+
+
+class LazyWidget(QtWidgets.QWidget):
+    """placeholder attached by qcreate(..., lazy=True).
+
+    the real widget is built inside the placeholder the first time it is shown, or as soon as code
+    touches it through .widget or any attribute the placeholder itself doesn't have.
+    """
+    materialized = QtCore.Signal(object)
+
+    def __init__(self, uiClass, args, kwargs, builder=None):
+        self._widget = None
+        super(LazyWidget, self).__init__()
+        self._uiClass = uiClass
+        self._args = args
+        self._kwargs = kwargs
+        self._builder = builder
+        # TabLayout reads the tab title before the page is built.
+        self.title = _initArgument(uiClass, "title", args, kwargs, "")
+
+        self._layout = VBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def widget(self):
+        return self.materialize()
+
+    def isMaterialized(self):
+        return self._widget is not None
+
+    def materialize(self):
+        if self._widget is None:
+            from ..base import qcreate
+
+            with self._layout:
+                widget = qcreate(self._uiClass, *self._args, **self._kwargs)
+                if self._builder:
+                    self._builder(widget)
+            self._widget = widget
+            self._args = self._kwargs = self._builder = None
+            self.materialized.emit(widget)
+        return self._widget
+
+    def showEvent(self, event):
+        self.materialize()
+        super(LazyWidget, self).showEvent(event)
+
+    def __getattr__(self, item):
+        if item.startswith("_"):
+            raise AttributeError(item)
+        return getattr(self.materialize(), item)
+
+
+class LabelPainter(QtCore.QObject):
+    """draws the labels of "painted" label mode fields onto the widget that holds them.
+
+    one shared instance filters the labelled fields, to follow them to their parent widget, and
+    those parent widgets, to paint every labelled child into the spacer its layout reserved. the
+    parent paints itself first, so frames and group boxes don't paint over the labels.
+    """
+    # filled in place: PySide2 5.13 on python 3.11 keeps serving the old value of a rebound class attribute.
+    _instances = {}
+
+    @classmethod
+    def instance(cls):
+        if cls not in cls._instances:
+            cls._instances[cls] = cls()
+        return cls._instances[cls]
+
+    def eventFilter(self, obj, event):
+        eventType = event.type()
+        if eventType == QtCore.QEvent.Paint:
+            labelled = self._labelled(obj)
+            if labelled:
+                # let the widget paint itself, then paint the labels on top and swallow the event.
+                obj.event(event)
+                self._paintLabels(obj, labelled)
+                return True
+        elif isinstance(obj, LabelMixin):
+            if eventType == QtCore.QEvent.ParentChange:
+                parent = QtWidgets.QWidget.parentWidget(obj)
+                if parent is not None:
+                    parent.installEventFilter(self)
+            elif eventType in (QtCore.QEvent.Polish, QtCore.QEvent.FontChange):
+                # the style may change the font after construction, so size the label again.
+                obj._sizeLabelSpacer()
+            elif eventType in (QtCore.QEvent.Show, QtCore.QEvent.Hide, QtCore.QEvent.EnabledChange):
+                parent = QtWidgets.QWidget.parentWidget(obj)
+                if parent is not None and obj._labelSpacer is not None:
+                    try:
+                        parent.update(obj._labelSpacer.geometry())
+                    except RuntimeError:
+                        # the layout owning the spacer is already gone while the form is torn down.
+                        pass
+        return False
+
+    def _labelled(self, widget):
+        return [child for child in widget.children()
+                if isinstance(child, LabelMixin) and child._labelSpacer is not None and not child.isHidden()]
+
+    def _paintLabels(self, widget, labelled):
+        painter = QtGui.QPainter(widget)
+        try:
+            for child in labelled:
+                try:
+                    rect = child._labelSpacer.geometry()
+                except RuntimeError:
+                    continue
+                drawLabel(painter, rect, child._label, child, child._labelPos)
+        finally:
+            painter.end()
+
+
+def drawLabel(painter, rect, text, field, position="left"):
+    """paint text for field into rect, the area reserved on the `position` side of it.
+
+    the text keeps to the far side of rect (rect includes the gap towards the field), in the field's
+    font and enabled/disabled text colour, elided when rect is too narrow.
+    """
+    if not rect.isValid():
+        return
+    font = field.font()
+    metrics = fontMetrics(font)
+    width = textWidth(text, font)
+    rect = QtCore.QRect(rect)
+    if position == LabelMixin.Position.Right:
+        rect.setLeft(max(rect.left(), rect.right() + 1 - width))
+    elif position == LabelMixin.Position.Left:
+        rect.setWidth(min(width, rect.width()))
+    elif position == LabelMixin.Position.Top:
+        rect.setHeight(metrics.height())
+    else:
+        rect.setTop(rect.bottom() + 1 - metrics.height())
+
+    if rect.width() < width:
+        text = metrics.elidedText(text, QtCore.Qt.ElideRight, rect.width())
+    group = QtGui.QPalette.Active if field.isEnabled() else QtGui.QPalette.Disabled
+    painter.setFont(font)
+    painter.setPen(field.palette().color(group, QtGui.QPalette.WindowText))
+    painter.drawText(rect, int(QtCore.Qt.AlignLeft) | int(QtCore.Qt.AlignVCenter), text)
+
+
 class LabelMixin(object):
+    """optional label next to an input, set up by _initLayout from self._label and self._labelPos.
+
+    labelMode "widget" puts the input and a QLabel in a container widget (self.parentWidget).
+    "painted" only wraps the input in a layout (self.parentLayout) with a spacer that the shared
+    LabelPainter draws the text into, which saves the container widget and the QLabel per field.
+    labelWidget is None in that mode.
+    """
     class Position(object):
         Left = "left"
         Right = "right"
         Top = "top"
         Bottom = "bottom"
 
+    class Mode(object):
+        Widget = "widget"
+        Painted = "painted"
+
+    # default for fields created without labelMode=.
+    labelMode = Mode.Widget
+    _labelSpacer = None
+
+    def labelContainer(self):
+        """the widget or layout that goes into a parent layout in place of the field, None if unlabelled."""
+        return self.parentWidget if self.parentWidget is not None else self.parentLayout
+
+    def releaseLabel(self):
+        """take the field out of its label container and drop the container, returning the label text.
+
+        for containers that show the label themselves, like Form.
+        """
+        if self.parentWidget is not None:
+            self.setParent(None)
+            self.parentWidget.deleteLater()
+        elif self._labelSpacer is not None:
+            self.parentLayout.removeWidget(self)
+            self.removeEventFilter(LabelPainter.instance())
+            self._labelSpacer = None
+        self.labelWidget = None
+        self.parentWidget = None
+        self.parentLayout = None
+        return self._label
+
     def _initLayout(self, **kwargs):
+        if base.activeProfiler is not None:
+            return base.activeProfiler.timed("initLayout", self._initLabelLayout, **kwargs)
+        self._initLabelLayout(**kwargs)
+
+    def _sizeLabelSpacer(self):
+        metrics = fontMetrics(self.font())
+        # box layouts add no spacing next to spacer items, so the gap a QLabel would get is part of the spacer.
+        if self._labelPos in (self.Position.Left, self.Position.Right):
+            gap = self.style().pixelMetric(QtWidgets.QStyle.PM_LayoutHorizontalSpacing)
+            width, height = textWidth(self._label, self.font()) + max(gap, 0), metrics.height()
+            policies = (QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+        else:
+            gap = self.style().pixelMetric(QtWidgets.QStyle.PM_LayoutVerticalSpacing)
+            width, height = textWidth(self._label, self.font()), metrics.height() + max(gap, 0)
+            policies = (QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self._labelSpacer.changeSize(width, height, *policies)
+        if self.parentLayout is not None:
+            self.parentLayout.invalidate()
+
+    def _initPaintedLabel(self):
+        if self._labelPos in (self.Position.Left, self.Position.Right):
+            self.parentLayout = QtWidgets.QHBoxLayout()
+        else:
+            self.parentLayout = QtWidgets.QVBoxLayout()
+        self._labelSpacer = QtWidgets.QSpacerItem(0, 0)
+        self._sizeLabelSpacer()
+
+        if self._labelPos in (self.Position.Left, self.Position.Top):
+            self.parentLayout.addItem(self._labelSpacer)
+            self.parentLayout.addWidget(self)
+        else:
+            self.parentLayout.addWidget(self)
+            self.parentLayout.addItem(self._labelSpacer)
+        self.parentLayout.setContentsMargins(0, 0, 0, 0)
+
+        try:
+            if self._width is not None:
+                self.setFixedWidth(self._width)
+        except AttributeError:
+            pass
+
+        # self.parentWidget is the (empty) container attribute, ask QWidget for the real parent.
+        painter = LabelPainter.instance()
+        self.installEventFilter(painter)
+        parent = QtWidgets.QWidget.parentWidget(self)
+        if parent is not None:
+            parent.installEventFilter(painter)
+
+    def _initLabelLayout(self, **kwargs):
         self.labelWidget = None
         self.parentWidget = None
         self.parentLayout = None
-        if self._label is not None:
+        if self._label is not None and getattr(self, "_labelMode", self.labelMode) == self.Mode.Painted:
+            self._initPaintedLabel()
+        elif self._label is not None:
 
             self.parentWidget = QtWidgets.QWidget()
 
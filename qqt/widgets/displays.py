@@ -1,17 +1,25 @@
+from functools import partial
+
 from .. import QtCore, QtGui, qcreate, QtWidgets
-from ..layouts import LayoutMixin, HBoxLayout, VBoxLayout
-from ..lib import pixmap
+from ..layouts import LayoutMixin, GridLayout, HBoxLayout, VBoxLayout
+from ..lib import pixmap, pixmapAsync, textWidth
+from ..resources.memory import ImageMemory
 
 
 class Image(QtWidgets.QLabel):
     clicked = QtCore.Signal()
 
-    def __init__(self, image, parent=None, w=None, h=None, fixed=False):
+    def __init__(self, image, parent=None, w=None, h=None, fixed=False, asyncLoad=False):
         super(Image, self).__init__(parent)
         self.w = w
         self.h = h
+        self.fixed = fixed
+        self._imageRequest = 0
+        self._source = None
+        self._downgraded = False
+        self._shown = False
 
-        pic = self.setImage(image, w=w, h=h)
+        pic = self.setImage(image, w=w, h=h, asyncLoad=asyncLoad)
         if fixed:
             self.setFixedWidth(pic.width())
             self.setFixedHeight(pic.height())
@@ -20,12 +28,52 @@ class Image(QtWidgets.QLabel):
         super(Image, self).mousePressEvent(*args, **kwargs)
         self.clicked.emit()
 
-    def setImage(self, img, w=None, h=None):
+    def setImage(self, img, w=None, h=None, asyncLoad=False):
+        self._imageRequest += 1
+        self._downgraded = False
+        self._source = None
         if not isinstance(img, QtGui.QPixmap):
-            img = pixmap(img, w=w, h=h)
+            self._source = (img, w, h, asyncLoad)
+            if asyncLoad:
+                callback = partial(self._imageLoaded, self._imageRequest)
+                img = pixmapAsync(img, callback, w=w, h=h, target=self)
+            else:
+                img = pixmap(img, w=w, h=h)
         self.setPixmap(img)
         return img
 
+    def setPixmap(self, pic):
+        super(Image, self).setPixmap(pic)
+        ImageMemory.track(self, pic)
+
+    def downgrade(self, size):
+        """swap in a thumbnail to save memory. the full image is reloaded the next time the widget is shown."""
+        if self._source is None or self._downgraded or not self.pixmap():
+            return
+        self._imageRequest += 1
+        self._downgraded = True
+        self.setPixmap(pixmap(self.pixmap(), w=size, h=size))
+
+    def isOffscreen(self):
+        """true once the widget was shown and is hidden again. never-shown widgets don't count."""
+        return self._shown and not self.isVisible()
+
+    def showEvent(self, event):
+        super(Image, self).showEvent(event)
+        self._shown = True
+        if self._downgraded:
+            img, w, h, asyncLoad = self._source
+            self.setImage(img, w=w, h=h, asyncLoad=asyncLoad)
+
+    def _imageLoaded(self, request, pic):
+        # a newer setImage call superseded this one.
+        if request != self._imageRequest:
+            return
+        self.setPixmap(pic)
+        if self.fixed:
+            self.setFixedWidth(pic.width())
+            self.setFixedHeight(pic.height())
+
 
 class Spacer(QtWidgets.QSpacerItem):
     def __init__(self, mode="horizontal"):
@@ -74,6 +122,110 @@ class TabLayout(QtWidgets.QTabWidget, LayoutMixin):
         self.addTab(widget, widget.title)
 
 
+class Form(QtWidgets.QWidget, LayoutMixin):
+    """two column container whose labelled inputs share one label column.
+
+    add() (so qcreate in its `with` block) takes labelled inputs out of their own label container
+    and puts the label, measured once through lib.textWidth, into column 0 of its grid and the input
+    into column 1, so a column of fields lines up. labelMode "painted" (default) reserves the label
+    cell with a spacer and paints the text; "widget" uses one QLabel per row. inputs labelled on
+    another side than the left keep their own label container, which like anything else added to the
+    form spans both columns.
+    """
+
+    def __init__(self, parent=None, labelMode="painted"):
+        super(Form, self).__init__(parent)
+        self._labelMode = labelMode
+        self._rowCount = 0
+        # (label spacer, text, field) of the painted labels
+        self._paintedLabels = []
+        # field: QLabel in widget label mode
+        self._labelWidgets = {}
+
+        self.grid = GridLayout(self)
+        self.grid.setContentsMargins(0, 0, 0, 0)
+        self.grid.setColumnStretch(1, 1)
+
+    def add(self, child):
+        from .base import LabelMixin
+        if isinstance(child, LabelMixin) and child._label is not None and child._labelPos == LabelMixin.Position.Left:
+            self.addRow(child.releaseLabel(), child)
+        elif isinstance(child, LabelMixin) and child.labelContainer() is not None:
+            self.addRow(None, child.labelContainer())
+        else:
+            self.addRow(None, child)
+
+    def addWidget(self, widget):
+        self.addRow(None, widget)
+
+    def addLayout(self, layout):
+        self.addRow(None, layout)
+
+    def addItem(self, item):
+        self.addRow(None, item)
+
+    def addRow(self, label, item):
+        """append item (widget, layout or spacer item), with label text in the label column if given."""
+        self._countAttach(item)
+        row = self._rowCount
+        self._rowCount += 1
+
+        if label is None:
+            self._addCell(item, row, 0, 2)
+            return
+
+        if self._labelMode == "widget":
+            labelWidget = QtWidgets.QLabel(label)
+            self.grid.addWidget(labelWidget, row, 0)
+            if isinstance(item, QtWidgets.QWidget):
+                labelWidget.setBuddy(item)
+                self._labelWidgets[item] = labelWidget
+                item.installEventFilter(self)
+        else:
+            source = item if isinstance(item, QtWidgets.QWidget) else self
+            gap = self.style().pixelMetric(QtWidgets.QStyle.PM_LayoutHorizontalSpacing)
+            spacer = QtWidgets.QSpacerItem(textWidth(label, source.font()) + max(gap, 0), 0,
+                                           QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Minimum)
+            self.grid.addItem(spacer, row, 0)
+            self._paintedLabels.append((spacer, label, source))
+            if source is not self:
+                source.installEventFilter(self)
+        self._addCell(item, row, 1, 1)
+
+    def _addCell(self, item, row, column, columnSpan):
+        if isinstance(item, QtWidgets.QWidget):
+            self.grid.addWidget(item, row, column, 1, columnSpan)
+        elif isinstance(item, QtWidgets.QLayout):
+            self.grid.addLayout(item, row, column, 1, columnSpan)
+        elif isinstance(item, QtWidgets.QLayoutItem):
+            self.grid.addItem(item, row, column, 1, columnSpan)
+
+    def eventFilter(self, obj, event):
+        # keep a field's label hidden / disabled along with the field.
+        if event.type() in (QtCore.QEvent.ShowToParent, QtCore.QEvent.HideToParent, QtCore.QEvent.EnabledChange):
+            labelWidget = self._labelWidgets.get(obj)
+            if labelWidget is not None:
+                labelWidget.setVisible(not obj.isHidden())
+                labelWidget.setEnabled(obj.isEnabled())
+            else:
+                self.update()
+        return False
+
+    def paintEvent(self, event):
+        super(Form, self).paintEvent(event)
+        if not self._paintedLabels:
+            return
+        from .base import drawLabel
+
+        painter = QtGui.QPainter(self)
+        try:
+            for spacer, text, source in self._paintedLabels:
+                if source is self or not source.isHidden():
+                    drawLabel(painter, spacer.geometry(), text, source)
+        finally:
+            painter.end()
+
+
 class TabWidget(QtWidgets.QWidget):
     def __init__(self, title=""):
         super(TabWidget, self).__init__()
@@ -1,8 +1,11 @@
+import sys
+import time
+import weakref
 from functools import partial
-from .. import QtGui, QtCore, QtWidgets, qcreate
+from .. import QtGui, QtCore, QtWidgets, QtCompat, qcreate
 from ..layouts import VBoxLayout, HBoxLayout
 from .base import LabelMixin
-from ..lib import pixmap
+from ..lib import fontMetrics, pixmap, textWidth
 
 Qt = QtCore.Qt
 
@@ -36,12 +39,12 @@ class Button(QtWidgets.QPushButton, InputMixin, LabelMixin):
     def __init__(self, *args, **kwargs):
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
         icon = kwargs.pop("icon", None)
         super(Button, self).__init__(*args, **kwargs)
         if icon:
-            if isinstance(icon, str):
-                icon = QtGui.QIcon(icon)
-            self.setIcon(icon)
+            from ..resources.icon import IconManager
+            self.setIcon(IconManager.toIcon(icon, iconSize=self.iconSize()))
 
         self._initLayout()
         self._connectSignals()
@@ -50,14 +53,444 @@ class Button(QtWidgets.QPushButton, InputMixin, LabelMixin):
         pass
 
 
-class ComboBox(QtWidgets.QComboBox, InputMixin, LabelMixin):
+class ComboModel(QtCore.QAbstractListModel):
+    """flat list of (text, data) rows behind ComboBox, with hash indexes for text and data lookups.
+
+    the indexes map to the first row holding a value, like list.index. unhashable data is kept out of
+    the data index and scanned separately. rows inserted or removed anywhere but the end mark the
+    indexes stale; they are rebuilt on the next lookup. every other role (icons, tooltips, ...) is
+    stored per row as {role: value}, without an index.
+    """
+
+    def __init__(self, parent=None):
+        super(ComboModel, self).__init__(parent)
+        self._texts = []
+        self._data = []
+        # None for rows with no other roles set, the common case.
+        self._roles = []
+        self._textIndex = {}
+        self._dataIndex = {}
+        self._unhashableRows = []
+        self._indexed = True
+        # built on demand, dropped by _changed()
+        self._searchIndex = None
+        self._maxTextWidths = {}
+        self._iconRows = None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._texts)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._texts):
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._texts[index.row()]
+        elif role == Qt.UserRole:
+            return self._data[index.row()]
+        roles = self._roles[index.row()]
+        return roles.get(role) if roles else None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.row() >= len(self._texts):
+            return False
+        row = index.row()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            self._texts[row] = value
+            self._changed()
+        elif role == Qt.UserRole:
+            self._data[row] = value
+            self._changed()
+        else:
+            roles = self._roles[row]
+            if roles is None:
+                roles = self._roles[row] = {}
+            if value is None:
+                roles.pop(role, None)
+            else:
+                roles[role] = value
+            if role == Qt.DecorationRole:
+                self._maxTextWidths = {}
+                self._iconRows = None
+        self.dataChanged.emit(index, index)
+        return True
+
+    def itemData(self, index):
+        """{role: value} of every role set on index's row."""
+        if not index.isValid() or index.row() >= len(self._texts):
+            return {}
+        row = index.row()
+        result = dict(self._roles[row] or {})
+        result[Qt.DisplayRole] = result[Qt.EditRole] = self._texts[row]
+        if self._data[row] is not None:
+            result[Qt.UserRole] = self._data[row]
+        return result
+
+    def insertRows(self, row, count, parent=QtCore.QModelIndex()):
+        if parent.isValid() or count < 1:
+            return False
+        self.beginInsertRows(parent, row, row + count - 1)
+        self._texts[row:row] = [""] * count
+        self._data[row:row] = [None] * count
+        self._roles[row:row] = [None] * count
+        self._changed()
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QtCore.QModelIndex()):
+        if parent.isValid() or count < 1 or row + count > len(self._texts):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._texts[row:row + count]
+        del self._data[row:row + count]
+        del self._roles[row:row + count]
+        self._changed()
+        self.endRemoveRows()
+        return True
+
+    def setItems(self, texts, data):
+        """replace every row with one model reset."""
+        self.beginResetModel()
+        self._texts = list(texts)
+        self._data = list(data)
+        self._roles = [None] * len(self._texts)
+        self._changed()
+        self._buildIndexes()
+        self.endResetModel()
+
+    def appendItem(self, text, data):
+        row = len(self._texts)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self._texts.append(text)
+        self._data.append(data)
+        self._roles.append(None)
+        indexed = self._indexed
+        self._changed()
+        if indexed:
+            self._indexRow(row)
+            self._indexed = True
+        self.endInsertRows()
+
+    def texts(self):
+        return list(self._texts)
+
+    def rowForText(self, text):
+        if not self._indexed:
+            self._buildIndexes()
+        return self._textIndex.get(text, -1)
+
+    def rowForData(self, data):
+        if not self._indexed:
+            self._buildIndexes()
+        try:
+            row = self._dataIndex.get(data, -1)
+        except TypeError:
+            row = -1
+        for candidate in self._unhashableRows:
+            if row >= 0 and candidate > row:
+                break
+            if self._data[candidate] == data:
+                return candidate
+        return row
+
+    def maxTextWidth(self, font, iconWidth=0):
+        """widest row in font, in pixels: its text, plus iconWidth on rows with an icon."""
+        key = (font.key(), iconWidth)
+        width = self._maxTextWidths.get(key)
+        if width is None:
+            metrics = fontMetrics(font)
+            widths = dict((text, metrics.boundingRect(text).width()) for text in set(self._texts))
+            width = max(list(widths.values()) or [0])
+            for row in self.iconRows():
+                width = max(width, widths[self._texts[row]] + iconWidth)
+            self._maxTextWidths[key] = width
+        return width
+
+    def iconRows(self):
+        """rows with a non-null decoration."""
+        if self._iconRows is None:
+            self._iconRows = [row for row, roles in enumerate(self._roles)
+                              if roles and self._isIcon(roles.get(Qt.DecorationRole))]
+        return self._iconRows
+
+    @staticmethod
+    def _isIcon(value):
+        if isinstance(value, (QtGui.QIcon, QtGui.QPixmap)):
+            return not value.isNull()
+        return value is not None
+
+    def search(self, query, rows=None):
+        """rows whose text contains query, case insensitive, in row order.
+
+        rows narrows the search to an earlier result, e.g. the matches of a shorter query. without it
+        the rarest character of query picks the candidate rows from a character index built once
+        per change of the items, so a search never has to scan every row.
+        """
+        query = query.lower()
+        if not query:
+            return list(range(len(self._texts))) if rows is None else list(rows)
+        if self._searchIndex is None:
+            lowered = [text.lower() for text in self._texts]
+            byChar = {}
+            for row, text in enumerate(lowered):
+                for char in set(text):
+                    byChar.setdefault(char, []).append(row)
+            self._searchIndex = (lowered, byChar)
+        lowered, byChar = self._searchIndex
+        if rows is None:
+            rows = min([byChar.get(char, ()) for char in set(query)], key=len)
+        return [row for row in rows if query in lowered[row]]
+
+    def _changed(self):
+        self._indexed = False
+        self._searchIndex = None
+        self._maxTextWidths = {}
+        self._iconRows = None
+
+    def _indexRow(self, row):
+        self._textIndex.setdefault(self._texts[row], row)
+        data = self._data[row]
+        try:
+            self._dataIndex.setdefault(data, row)
+        except TypeError:
+            self._unhashableRows.append(row)
+
+    def _buildIndexes(self):
+        self._textIndex = {}
+        self._dataIndex = {}
+        self._unhashableRows = []
+        for row in range(len(self._texts)):
+            self._indexRow(row)
+        self._indexed = True
+
+
+class ComboFilterModel(QtCore.QAbstractListModel):
+    """the rows of a ComboModel that match the search text of a ComboPopup.
+
+    any change of the source re-runs the current query, with a model reset, and emits refreshed.
+    """
+    refreshed = QtCore.Signal()
+
+    def __init__(self, source, parent=None):
+        super(ComboFilterModel, self).__init__(parent)
+        self._source = source
+        self._query = ""
+        self._rows = None
+        source.modelReset.connect(self.refresh)
+        source.rowsInserted.connect(self.refresh)
+        source.rowsRemoved.connect(self.refresh)
+        source.dataChanged.connect(self.refresh)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._source.rowCount() if self._rows is None else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self._source.data(self._source.index(self.sourceRow(index.row()), 0), role)
+
+    def sourceRow(self, row):
+        return row if self._rows is None else self._rows[row]
+
+    def filterRow(self, sourceRow):
+        if self._rows is None:
+            return sourceRow
+        try:
+            return self._rows.index(sourceRow)
+        except ValueError:
+            return -1
+
+    def setQuery(self, query):
+        """filter to the rows containing query. a query extending the last one only searches its matches."""
+        query = query.lower()
+        if query == self._query:
+            return
+        if not query:
+            rows = None
+        elif self._query and self._query in query and self._rows is not None:
+            rows = self._source.search(query, self._rows)
+        else:
+            rows = self._source.search(query)
+        self.beginResetModel()
+        self._query = query
+        self._rows = rows
+        self.endResetModel()
+
+    def refresh(self, *args):
+        """search the source again for the current query."""
+        self.beginResetModel()
+        self._rows = self._source.search(self._query) if self._query else None
+        self.endResetModel()
+        self.refreshed.emit()
+
+    def reset(self):
+        self.beginResetModel()
+        self._query = ""
+        self._rows = None
+        self.endResetModel()
+
+
+class ComboPopup(QtWidgets.QFrame):
+    """searchable popup of a ComboBox: a filter field over a list view with uniform row heights."""
+    rowChosen = QtCore.Signal(int)
+
+    def __init__(self, source, parent=None):
+        super(ComboPopup, self).__init__(parent, Qt.Popup)
+        self.setFrameStyle(QtWidgets.QFrame.StyledPanel)
+        self.filterModel = ComboFilterModel(source, self)
+        self._combo = None
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(1, 1, 1, 1)
+        layout.setSpacing(1)
+        self.filterField = QtWidgets.QLineEdit()
+        self.filterField.setPlaceholderText("search")
+        layout.addWidget(self.filterField)
+
+        self.view = QtWidgets.QListView()
+        self.view.setUniformItemSizes(True)
+        self.view.setModel(self.filterModel)
+        layout.addWidget(self.view)
+
+        self.filterField.textEdited.connect(self._filter)
+        self.filterField.installEventFilter(self)
+        self.view.clicked.connect(self._choose)
+        self.view.activated.connect(self._choose)
+        self.filterModel.refreshed.connect(self.selectCurrent)
+
+    def popup(self, combo, maxVisibleItems=10):
+        self._combo = combo
+        self.filterField.clear()
+        self.filterModel.reset()
+
+        rowHeight = self.view.sizeHintForRow(0) if self.filterModel.rowCount() else combo.height()
+        visibleRows = max(min(self.filterModel.rowCount(), maxVisibleItems), 1)
+        height = self.filterField.sizeHint().height() + rowHeight * visibleRows + 2 * self.view.frameWidth() + 4
+        self.setGeometry(QtCore.QRect(combo.mapToGlobal(QtCore.QPoint(0, combo.height())),
+                                      QtCore.QSize(combo.width(), height)))
+
+        self.selectCurrent()
+        self.show()
+        self.filterField.setFocus()
+
+    def selectCurrent(self):
+        """select the combo's current item when the filter shows it, else the first row."""
+        row = self.filterModel.filterRow(self._combo.currentIndex()) if self._combo is not None else -1
+        if row < 0 and self.filterModel.rowCount():
+            row = 0
+        if row >= 0:
+            index = self.filterModel.index(row, 0)
+            self.view.setCurrentIndex(index)
+            self.view.scrollTo(index, QtWidgets.QAbstractItemView.PositionAtCenter)
+
+    def _filter(self, text):
+        self.filterModel.setQuery(text)
+        if self.filterModel.rowCount():
+            self.view.setCurrentIndex(self.filterModel.index(0, 0))
+
+    def _choose(self, index):
+        # clicked and activated both arrive for a single click where clicking activates.
+        if index.isValid() and self.isVisible():
+            self.hide()
+            self.rowChosen.emit(self.filterModel.sourceRow(index.row()))
+
+    def eventFilter(self, obj, event):
+        if obj is self.filterField and event.type() == QtCore.QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+                QtWidgets.QApplication.sendEvent(self.view, event)
+                return True
+            elif key in (Qt.Key_Return, Qt.Key_Enter):
+                self._choose(self.view.currentIndex())
+                return True
+            elif key == Qt.Key_Escape:
+                self.hide()
+                return True
+        return False
+
+
+class _ProviderRelay(QtCore.QObject):
+    """lives in the main thread, so provider results emitted from the pool are delivered there."""
+    finished = QtCore.Signal(object, object)
+    _instances = {}
+
+    def __init__(self):
+        super(_ProviderRelay, self).__init__()
+        self.finished.connect(self.deliver)
+
+    @classmethod
+    def instance(cls):
+        if cls not in cls._instances:
+            cls._instances[cls] = cls()
+        return cls._instances[cls]
+
+    @QtCore.Slot(object, object)
+    def deliver(self, token, entries):
+        ref = _providerRequests.pop(token, None)
+        combo = ref() if ref is not None else None
+        # the combo, or just its C++ side, may be gone by the time the provider is done.
+        if combo is not None and QtCompat.isValid(combo):
+            combo._providerLoaded(token, entries)
+
+
+class _ProviderTask(QtCore.QRunnable):
+    def __init__(self, provider, token, relay):
+        super(_ProviderTask, self).__init__()
+        self.provider = provider
+        self.token = token
+        self.relay = relay
+
+    def run(self):
+        try:
+            entries = list(self.provider())
+        except Exception as e:
+            entries = e
+        self.relay.finished.emit(self.token, entries)
+
+
+# provider: (load time, entries), shared by every ComboBox using the provider.
+_providerCache = {}
+# token: weakref to the ComboBox waiting for an async provider.
+_providerRequests = {}
+
+
+class ComboBoxDefaults(object):
+    """ComboBox defaults, changed here rather than on ComboBox (PySide2 5.13 on python 3.11 keeps serving
+    the old value of a class attribute rebound on a Qt class)."""
+    # above this many items the size hints come from widths cached by the model, as in searchable mode.
+    largeItemCount = 100
+
+
+class ComboBox(QtWidgets.QComboBox, InputMixin, LabelMixin, ComboBoxDefaults):
     valueEdited = QtCore.Signal(int)
+    # emitted when items from an item provider were put in.
+    itemsLoaded = QtCore.Signal()
+    # emitted with the exception when an item provider raised.
+    providerFailed = QtCore.Signal(object)
 
     def __init__(self, *args, **kwargs):
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
         width = kwargs.pop("width", None)
+        self._searchable = kwargs.pop("searchable", False)
+        provider = kwargs.pop("provider", None)
+        providerAsync = kwargs.pop("providerAsync", False)
+        providerTTL = kwargs.pop("providerTTL", None)
         super(ComboBox, self).__init__(*args, **kwargs)
+        self._itemModel = ComboModel(self)
+        self.setModel(self._itemModel)
+        self._popup = None
+        self._provider = None
+        self._providerAsync = False
+        self._providerTTL = None
+        self._providerToken = None
+        self._itemsLoadedAt = None
+        if provider is not None:
+            self.setItemProvider(provider, asyncLoad=providerAsync, ttl=providerTTL)
         if width:
             self.setMinimumWidth(width)
         self._initLayout()
@@ -70,25 +503,223 @@ class ComboBox(QtWidgets.QComboBox, InputMixin, LabelMixin):
         self.valueEdited.emit(index)
 
     def setItems(self, items, data=None):
-        data = data or [None] * len(items)
-        while self.count() > 0:
-            for idx in range(self.count()):
-                self.removeItem(idx)
-
-        for item, dt in zip(items, data):
-            self.addItem(item, data)
+        """replace all items at once. each item's data defaults to the item itself."""
+        if data is None:
+            data = items
+        elif len(data) < len(items):
+            data = list(data) + list(items[len(data):])
+        self._itemModel.setItems([str(item) for item in items], data[:len(items)])
+        # a reset leaves no current item, refilling one by one used to select the first.
+        if self.count() and self.currentIndex() < 0:
+            self.setCurrentIndex(0)
 
     def items(self):
-        items = []
-        for idx in range(self.count()):
-            items.append(self.itemText(idx))
-        return items
-
-    def addItem(self, item, data=None):
-        QtWidgets.QComboBox.addItem(self, str(item))
-        idx = self.count() - 1
+        return self._itemModel.texts()
+
+    def addItem(self, item, data=None, userData=None):
+        """addItem(item, data=None), or addItem(icon, item, data=None) like QComboBox."""
+        icon = None
+        if isinstance(item, QtGui.QIcon):
+            icon, item, data = item, data, userData
         data = data if data is not None else item
-        self.setItemData(idx, data)
+        self._itemModel.appendItem(str(item), data)
+        if icon is not None:
+            self.setItemIcon(self.count() - 1, icon)
+
+    def setItemProvider(self, provider, asyncLoad=False, ttl=None):
+        """fill the items from provider() the first time the popup opens, instead of up front.
+
+        provider returns an iterable of items, each an item or an (item, data) pair. with asyncLoad it
+        runs on the global QThreadPool and the popup shows the current items until it is done. results
+        are shared by every ComboBox using the same provider and reused for ttl seconds (forever when
+        None) or until invalidateItems(). setCurrentItem() shows a value without running the provider.
+        an exception raised by provider is emitted as providerFailed, or passed to sys.excepthook when
+        nothing is connected to it; the items stay as they were.
+        """
+        self._provider = provider
+        self._providerAsync = asyncLoad
+        self._providerTTL = ttl
+        self._providerToken = None
+        self._itemsLoadedAt = None
+
+    def itemProvider(self):
+        return self._provider
+
+    def invalidateItems(self):
+        """drop the provider results, so they are enumerated again on the next popup, or now if it is open."""
+        if self._provider is None:
+            return
+        _providerCache.pop(self._provider, None)
+        self._itemsLoadedAt = None
+        if self._popupVisible():
+            self.loadItems()
+
+    def loadItems(self, force=False):
+        """run the item provider now, if its results are missing or expired (always with force)."""
+        if self._provider is None or self._providerToken is not None:
+            return
+        now = time.time()
+        if not force and self._itemsLoadedAt is not None and not self._expired(self._itemsLoadedAt, now):
+            return
+
+        cached = _providerCache.get(self._provider)
+        if not force and cached is not None and not self._expired(cached[0], now):
+            self._applyEntries(cached[1], cached[0])
+        elif self._providerAsync:
+            self._providerToken = object()
+            _providerRequests[self._providerToken] = weakref.ref(self)
+            QtCore.QThreadPool.globalInstance().start(
+                _ProviderTask(self._provider, self._providerToken, _ProviderRelay.instance()))
+        else:
+            try:
+                entries = list(self._provider())
+            except Exception as e:
+                self._providerError(e)
+                return
+            _providerCache[self._provider] = (now, entries)
+            self._applyEntries(entries, now)
+
+    def setCurrentItem(self, item, data=None):
+        """show item as the current value. with an unloaded provider this doesn't enumerate the items."""
+        data = data if data is not None else item
+        idx = -1 if self._itemsLoadedAt is None else self.indexFromData(data)
+        if idx < 0:
+            self.blockSignals(True)
+            try:
+                self._itemModel.setItems([str(item)], [data])
+                self.setCurrentIndex(0)
+            finally:
+                self.blockSignals(False)
+            idx = 0
+        self.setIndex(idx)
+
+    def _deferredByProvider(self):
+        # values can't be checked before the provider ran, show them as given.
+        return self._provider is not None and self._itemsLoadedAt is None
+
+    def _expired(self, loadedAt, now):
+        return self._providerTTL is not None and now - loadedAt > self._providerTTL
+
+    def _popupVisible(self):
+        return (self._popup is not None and self._popup.isVisible()) or self.view().isVisible()
+
+    def _providerLoaded(self, token, entries):
+        if token is not self._providerToken:
+            return
+        self._providerToken = None
+        if isinstance(entries, Exception):
+            self._providerError(entries)
+            return
+        now = time.time()
+        _providerCache[self._provider] = (now, entries)
+        self._applyEntries(entries, now)
+        if self._popup is not None and self._popup.isVisible():
+            # the popup's filter already re-ran on the new rows, keeping what was typed.
+            self._popup.selectCurrent()
+        elif self.view().isVisible():
+            # resize the open Qt popup to the new rows.
+            QtWidgets.QComboBox.showPopup(self)
+
+    def _providerError(self, error):
+        signal = self.metaObject().method(self.metaObject().indexOfSignal("providerFailed(PyObject)"))
+        if self.isSignalConnected(signal):
+            self.providerFailed.emit(error)
+        else:
+            sys.excepthook(type(error), error, getattr(error, "__traceback__", None))
+
+    def _applyEntries(self, entries, loadedAt):
+        items, data = [], []
+        for entry in entries:
+            if isinstance(entry, tuple) and len(entry) == 2:
+                items.append(entry[0])
+                data.append(entry[1])
+            else:
+                items.append(entry)
+                data.append(entry)
+
+        # keep the current value selected without a valueEdited, if it is still there.
+        currentData = self.itemData(self.currentIndex()) if self.currentIndex() >= 0 else None
+        currentText = self.currentText()
+        self.blockSignals(True)
+        try:
+            self._itemModel.setItems([str(item) for item in items], data)
+            idx = self.indexFromData(currentData) if currentData is not None else -1
+            if idx < 0:
+                idx = self._itemModel.rowForText(currentText)
+            self.setCurrentIndex(idx)
+        finally:
+            self.blockSignals(False)
+        self._itemsLoadedAt = loadedAt
+        if idx < 0 and self.count():
+            self.setCurrentIndex(0)
+        self.itemsLoaded.emit()
+
+    def setSearchable(self, searchable):
+        """open a ComboPopup with a filter field instead of the plain Qt popup."""
+        self._searchable = searchable
+
+    def isSearchable(self):
+        return self._searchable
+
+    def showPopup(self):
+        self.loadItems()
+        if not self._searchable:
+            return QtWidgets.QComboBox.showPopup(self)
+        if self._popup is None:
+            self._popup = ComboPopup(self._itemModel, self)
+            self._popup.rowChosen.connect(self._popupRowChosen)
+        self._popup.popup(self, self.maxVisibleItems())
+
+    def hidePopup(self):
+        if self._popup is not None and self._popup.isVisible():
+            self._popup.hide()
+        QtWidgets.QComboBox.hidePopup(self)
+
+    def _popupRowChosen(self, row):
+        # the same path as a pick in the Qt popup: currentIndexChanged drives valueEdited.
+        self.setCurrentIndex(row)
+        self.activated.emit(row)
+
+    def sizeHint(self):
+        if self._usesContentsHint():
+            return self._contentsSizeHint()
+        return QtWidgets.QComboBox.sizeHint(self)
+
+    def minimumSizeHint(self):
+        if self._usesContentsHint():
+            return self._contentsSizeHint(minimum=True)
+        return QtWidgets.QComboBox.minimumSizeHint(self)
+
+    def _usesContentsHint(self):
+        # QComboBox measures every row through the model for its size hints, a python call per row here.
+        return self._searchable or self.count() > self.largeItemCount
+
+    def _contentsSizeHint(self, minimum=False):
+        # QComboBox's own computation, with the text widths and icon rows cached by the model.
+        Policy = QtWidgets.QComboBox
+        policy = self.sizeAdjustPolicy()
+        metrics = fontMetrics(self.font())
+        iconSize = self.iconSize()
+        minimumLength = self.minimumContentsLength()
+        hasIcon = policy == Policy.AdjustToMinimumContentsLengthWithIcon or bool(self._itemModel.iconRows())
+
+        # an unset width is -1 in QComboBox, for the style to size from.
+        width = -1
+        if (not minimum or not minimumLength) and policy in (Policy.AdjustToContents,
+                                                             Policy.AdjustToContentsOnFirstShow):
+            if self.count():
+                width = self._itemModel.maxTextWidth(self.font(), iconSize.width() + 4)
+            else:
+                width = 7 * metrics.width("x")
+        if minimumLength > 0:
+            width = max(width, minimumLength * metrics.width("X") + (iconSize.width() + 4 if hasIcon else 0))
+
+        height = max(metrics.height(), 14) + 2
+        if hasIcon:
+            height = max(height, iconSize.height() + 2)
+        option = QtWidgets.QStyleOptionComboBox()
+        self.initStyleOption(option)
+        return self.style().sizeFromContents(QtWidgets.QStyle.CT_ComboBox, option, QtCore.QSize(width, height), self)
 
     def getValue(self):
         return self.currentText()
@@ -102,48 +733,118 @@ class ComboBox(QtWidgets.QComboBox, InputMixin, LabelMixin):
         self.valueEdited.emit(index)
 
     def setValue(self, value):
-        idx = self.findText(value)
+        idx = self._itemModel.rowForText(value)
         if idx >= 0:
             self.setCurrentIndex(idx)
+        elif self._deferredByProvider():
+            return self.setCurrentItem(value)
         else:
             raise ValueError("wrong or nonexistent value provided.")
         self.valueEdited.emit(idx)
 
     def indexFromData(self, data):
-        all_data = [self.getData(index=idx) for idx in range(self.count())]
-        try:
-            idx = all_data.index(data)
-            return idx
-        except ValueError:
-            return -1
+        return self._itemModel.rowForData(data)
 
     def setValueFromData(self, data):
         idx = self.indexFromData(data)
         if idx >= 0:
             self.setCurrentIndex(idx)
+        elif self._deferredByProvider():
+            return self.setCurrentItem(data, data)
         else:
             raise ValueError("wrong or nonexistent data provided.")
 
         self.valueEdited.emit(idx)
 
 
-class StringField(QtWidgets.QLineEdit, InputMixin, LabelMixin):
+class StringFieldDefaults(object):
+    """defaults for StringFields created without changingDelay= / changingMaxWait=, changed here rather
+    than on StringField (PySide2 5.13 on python 3.11 keeps serving the old value of a class attribute
+    rebound on a Qt class)."""
+    changingDelay = 150
+    changingMaxWait = None
+
+
+class StringField(QtWidgets.QLineEdit, InputMixin, LabelMixin, StringFieldDefaults):
+    """line edit emitting valueEdited when editing finished, and valueChanging while the user types.
+
+    valueChanging is debounced: it is emitted once typing paused for changingDelay ms, or at the latest
+    changingMaxWait ms after the first unsent keystroke (never forced when None). it always carries the
+    current text, intermediate values are dropped, and the same text isn't emitted twice in a row.
+    setText() and clear() drop a pending value and forget the last emitted one.
+    """
     valueEdited = QtCore.Signal(str)
+    valueChanging = QtCore.Signal(str)
 
     def __init__(self, *args, **kwargs):
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
+        self._changingDelay = kwargs.pop("changingDelay", self.changingDelay)
+        self._changingMaxWait = kwargs.pop("changingMaxWait", self.changingMaxWait)
+        self._changingTimer = None
+        self._changingSince = None
+        self._lastChanging = None
         super(StringField, self).__init__(*args, **kwargs)
         self._initLayout()
         self._connectSignals()
 
     def _connectSignals(self):
         self.editingFinished.connect(self.emitValueEdited)
+        self.textEdited.connect(self._textEdited)
 
     def emitValueEdited(self, value=None):
+        self.flushValueChanging()
         value = value or self.text()
         self.valueEdited.emit(value)
 
+    def setText(self, text):
+        self._resetChanging()
+        QtWidgets.QLineEdit.setText(self, text)
+
+    def clear(self):
+        self._resetChanging()
+        QtWidgets.QLineEdit.clear(self)
+
+    def _resetChanging(self):
+        # a programmatic change drops the pending value and what was last emitted, so typing the same
+        # text again is reported again.
+        self._changingSince = None
+        self._lastChanging = None
+        if self._changingTimer is not None:
+            self._changingTimer.stop()
+
+    def setChangingDelay(self, delay, maxWait=None):
+        """quiet period and max wait of valueChanging, in ms."""
+        self._changingDelay = delay
+        self._changingMaxWait = maxWait
+
+    def flushValueChanging(self):
+        """emit a pending valueChanging now."""
+        if self._changingSince is None:
+            return
+        self._changingSince = None
+        self._changingTimer.stop()
+        value = self.getValue()
+        if value != self._lastChanging:
+            self._lastChanging = value
+            self.valueChanging.emit(value)
+
+    def _textEdited(self, *args):
+        if self._changingTimer is None:
+            self._changingTimer = QtCore.QTimer(self)
+            self._changingTimer.setSingleShot(True)
+            self._changingTimer.timeout.connect(self.flushValueChanging)
+
+        now = time.time()
+        if self._changingSince is None:
+            self._changingSince = now
+        delay = self._changingDelay
+        if self._changingMaxWait is not None:
+            remaining = self._changingMaxWait - (now - self._changingSince) * 1000.0
+            delay = min(delay, remaining)
+        self._changingTimer.start(max(int(delay), 0))
+
     def getValue(self):
         return str(self.text())
 
@@ -160,6 +861,7 @@ class Checkbox(QtWidgets.QCheckBox, InputMixin, LabelMixin):
     def __init__(self, *args, **kwargs):
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
         default = kwargs.pop("default", True)
         super(Checkbox, self).__init__(*args, **kwargs)
         self._initLayout()
@@ -188,28 +890,35 @@ class IconButton(QtWidgets.QPushButton, InputMixin, LabelMixin):
         self._icon = icon
         self._width = kwargs.pop('w', 30)
         self._height = kwargs.pop('h', 30)
+        self._asyncLoad = kwargs.pop("asyncLoad", False)
         self._labelPos = kwargs.pop("labelPosition", "bottom")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
         super(IconButton, self).__init__(*args, **kwargs)
         self._initLayout()
         self._connectSignals()
         self._additionalSetup()
 
     def _additionalSetup(self):
+        from ..resources.icon import IconManager
+        from ..resources.memory import ImageMemory
         w, h = self._width, self._height
-        pix = pixmap(self._icon)
+        if isinstance(self._icon, QtGui.QPixmap):
+            icon = QtGui.QIcon(pixmap(self._icon))
+        elif self._asyncLoad:
+            icon = QtGui.QIcon(IconManager.getAsync(self._icon, self._iconLoaded, target=self, type="pixmap",
+                                                    size=(w, h)))
+        else:
+            icon = IconManager.toIcon(self._icon, size=(w, h))
         self.setFixedWidth(w)
         self.setFixedHeight(h)
-        icon = QtGui.QIcon(pix)
         self.setIcon(icon)
+        ImageMemory.track(self, icon)
         self.setIconSize(QtCore.QSize(w, h))
         self.setFlat(True)
         
         if self.labelWidget:
-            font = self.labelWidget.font()
-            fm = QtGui.QFontMetrics(font)
-            tw = fm.width(self.labelWidget.text())
-            self.labelWidget.setFixedWidth(tw)
+            self.labelWidget.setFixedWidth(textWidth(self.labelWidget.text(), self.labelWidget.font()))
 
             if self._labelPos in (LabelPosition.bottom, LabelPosition.top):
                 from ..widgets.displays import Spacer
@@ -238,6 +947,11 @@ class IconButton(QtWidgets.QPushButton, InputMixin, LabelMixin):
                 spacer = Spacer(mode="vertical")
                 self.parentLayout.addItem(spacer)
 
+    def _iconLoaded(self, pix):
+        from ..resources.memory import ImageMemory
+        self.setIcon(QtGui.QIcon(pix))
+        ImageMemory.track(self, pix)
+
     def _connectSignals(self):
         pass
 
@@ -250,6 +964,7 @@ class NumericField(QtWidgets.QLineEdit, InputMixin, LabelMixin):
         self._defaultValue = kwargs.pop("defaultValue", None)
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
         super(NumericField, self).__init__(*args, **kwargs)
         self._initLayout()
         self._connectSignals()
@@ -416,6 +1131,7 @@ class ColorInput(QtWidgets.QPushButton, InputMixin, LabelMixin):
     def __init__(self, *args, **kwargs):
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
         super(ColorInput, self).__init__(*args, **kwargs)
         self._initLayout()
         self._connectSignals()
@@ -452,6 +1168,7 @@ class RadioButtonGroup(QtWidgets.QWidget, InputMixin, LabelMixin):
     def __init__(self, *args, **kwargs):
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
         super(RadioButtonGroup, self).__init__(*args, **kwargs)
         self._initLayout()
         self._connectSignals()
@@ -511,8 +1228,34 @@ class RadioButtonGroup(QtWidgets.QWidget, InputMixin, LabelMixin):
         self.valueEdited.emit(self.getCurrentLabel())
 
 
-class NumericSliderField(QtWidgets.QWidget, InputMixin, LabelMixin):
+class SliderFieldDefaults(object):
+    """defaults for slider fields created without emitPolicy= / emitRate= / emitDelay=, changed here
+    rather than on the field classes (PySide2 5.13 on python 3.11 keeps serving the old value of a class
+    attribute rebound on a Qt class)."""
+    emitPolicy = "immediate"  # NumericSliderField.EmitPolicy.Immediate
+    emitRate = 30
+    emitDelay = 100
+
+
+class NumericSliderField(QtWidgets.QWidget, InputMixin, LabelMixin, SliderFieldDefaults):
+    """numeric field with a slider.
+
+    while the slider handle is dragged, valueEdited follows emitPolicy:
+        EmitPolicy.Immediate    every slider move (default).
+        EmitPolicy.RateLimited  at most emitRate times per second.
+        EmitPolicy.Trailing     once the handle rested for emitDelay ms.
+        EmitPolicy.Release      only when the drag ends.
+    the last value of a drag is always emitted, before dragEnded. edits outside a drag emit immediately.
+    """
     valueEdited = QtCore.Signal(float)
+    dragStarted = QtCore.Signal()
+    dragEnded = QtCore.Signal()
+
+    class EmitPolicy(object):
+        Immediate = "immediate"
+        RateLimited = "rate"
+        Trailing = "trailing"
+        Release = "release"
 
     @property
     def fieldClass(self):
@@ -523,6 +1266,14 @@ class NumericSliderField(QtWidgets.QWidget, InputMixin, LabelMixin):
         self.MAX_VAL = kwargs.pop("maxVal", self.DEFAULT_MAX)
         self._labelPos = kwargs.pop("labelPosition", "left")
         self._label = kwargs.pop("label", None)
+        self._labelMode = kwargs.pop("labelMode", self.labelMode)
+        self._emitPolicy = kwargs.pop("emitPolicy", self.emitPolicy)
+        self._emitRate = kwargs.pop("emitRate", self.emitRate)
+        self._emitDelay = kwargs.pop("emitDelay", self.emitDelay)
+        self._emitTimer = None
+        self._dragging = False
+        self._pending = False
+        self._pendingValue = None
         super(NumericSliderField, self).__init__(*args, **kwargs)
         self._initLayout()
 
@@ -554,8 +1305,9 @@ class NumericSliderField(QtWidgets.QWidget, InputMixin, LabelMixin):
         self.updateField()
 
     def _connectSignals(self):
-        self.slider.sliderPressed.connect(self.updateField)
+        self.slider.sliderPressed.connect(self._dragStart)
         self.slider.sliderMoved.connect(self.updateField)
+        self.slider.sliderReleased.connect(self._dragEnd)
         self.field.editingFinished.connect(self.fieldUpdated)
         self.minBtn.clicked.connect(partial(self.updateField, self.MIN_VAL))
         self.maxBtn.clicked.connect(partial(self.updateField, self.MAX_VAL))
@@ -572,6 +1324,75 @@ class NumericSliderField(QtWidgets.QWidget, InputMixin, LabelMixin):
     def updateField(self, val=None):
         raise NotImplementedError()
 
+    def setEmitPolicy(self, policy, rate=None, delay=None):
+        """how valueEdited is emitted during drags, see the class docstring. rate is in Hz, delay in ms."""
+        self._flushPending()
+        self._emitPolicy = policy
+        if rate is not None:
+            self._emitRate = rate
+        if delay is not None:
+            self._emitDelay = delay
+
+    def getEmitPolicy(self):
+        return self._emitPolicy
+
+    def isDragging(self):
+        return self._dragging
+
+    def _dragStart(self):
+        self._dragging = True
+        self.dragStarted.emit()
+        self.updateField()
+
+    def _dragEnd(self):
+        self._dragging = False
+        self._flushPending()
+        self.dragEnded.emit()
+
+    def _emitValue(self, value):
+        policy = self._emitPolicy
+        if not self._dragging or policy == self.EmitPolicy.Immediate:
+            self._cancelPending()
+            self.valueEdited.emit(value)
+            return
+
+        self._pending = True
+        self._pendingValue = value
+        if policy == self.EmitPolicy.Trailing:
+            self._timer().start(max(int(self._emitDelay), 0))
+        elif policy == self.EmitPolicy.RateLimited:
+            timer = self._timer()
+            if not timer.isActive():
+                # leading edge, then at most one emission per interval.
+                self._flushPending()
+                timer.start(max(int(1000.0 / self._emitRate), 1))
+
+    def _timer(self):
+        if self._emitTimer is None:
+            self._emitTimer = QtCore.QTimer(self)
+            self._emitTimer.setSingleShot(True)
+            self._emitTimer.timeout.connect(self._emitTimeout)
+        return self._emitTimer
+
+    def _emitTimeout(self):
+        if self._pending and self._emitPolicy == self.EmitPolicy.RateLimited:
+            self._flushPending()
+            self._emitTimer.start(max(int(1000.0 / self._emitRate), 1))
+        else:
+            self._flushPending()
+
+    def _cancelPending(self):
+        self._pending = False
+        self._pendingValue = None
+        if self._emitTimer is not None:
+            self._emitTimer.stop()
+
+    def _flushPending(self):
+        pending, value = self._pending, self._pendingValue
+        self._cancelPending()
+        if pending:
+            self.valueEdited.emit(value)
+
 
 class FloatSliderField(NumericSliderField):
     MIN_INT = -100
@@ -594,7 +1415,7 @@ class FloatSliderField(NumericSliderField):
         newVal = (1.0 * (val - self.MIN_INT) / (self.MAX_INT - self.MIN_INT)) * (self.MAX_VAL - self.MIN_VAL) + self.MIN_VAL
 
         self.field.setText(str(newVal))
-        self.valueEdited.emit(newVal)
+        self._emitValue(newVal)
 
     def getValue(self):
         text = self.field.text()
@@ -641,7 +1462,7 @@ class IntSliderField(NumericSliderField):
         val = val or self.slider.value()
 
         self.field.setText(str(val))
-        self.valueEdited.emit(val)
+        self._emitValue(val)
 
     def getValue(self):
         text = self.field.text()
@@ -67,7 +67,7 @@ class BaseList(QtWidgets.QWidget):
     def _connectSignals(self):
         self.selModel.selectionChanged.connect(self.selectionChangedCallback)
         # self.filterField.valueEdited.connect(self.updateFilter)
-        self.filterField.textEdited.connect(self.updateFilter)
+        self.filterField.valueChanging.connect(self.updateFilter)
 
     def selectionChangedCallback(self):
         pass